@@ -0,0 +1,33 @@
+"""
+Example usage of the Watchstander class.
+
+Run from the repository root with: python -m examples.watchstander_demo
+"""
+from src.watchstander import Watchstander
+
+if __name__ == "__main__":
+    watchstander1 = Watchstander("John Doe", True)  # N-head
+    watchstander2 = Watchstander("Jane Smith", False)  # Regular watchstander
+    
+    # Example availability vectors for January 2023
+    jan_availability1 = [0] * 31  # 31 days of January
+    jan_availability1[14:20] = [1, 2, 2, 2, 2, 3]  # Leave from 15th to 20th
+    watchstander1.set_monthly_availability(2023, 1, jan_availability1)
+    
+    jan_availability2 = [0] * 31  # 31 days of January
+    jan_availability2[10:15] = [1, 2, 2, 2, 3]  # Leave from 11th to 15th
+    watchstander2.set_monthly_availability(2023, 1, jan_availability2)
+    
+    # Example month vector for January 2023 (simplified)
+    jan_month_vector = [0] * 31  # All workdays for simplicity
+    jan_month_vector[6:8] = [1, 2, 2, 3]  # Weekend
+    jan_month_vector[13:15] = [1, 2, 2, 3]  # Weekend
+    jan_month_vector[20:22] = [1, 2, 2, 3]  # Weekend
+    jan_month_vector[27:29] = [1, 2, 2, 3]  # Weekend
+    
+    # Calculate expected watch points
+    points1 = watchstander1.calculate_expected_watch_points(2023, 1, jan_month_vector, n_head_count=1)
+    points2 = watchstander2.calculate_expected_watch_points(2023, 1, jan_month_vector, n_head_count=1)
+    
+    print(f"John Doe (N-head) expected watch points: {points1:.1f}")
+    print(f"Jane Smith (Regular) expected watch points: {points2:.1f}")
@@ -0,0 +1,228 @@
+"""
+Module for compiled numeric kernels used by the watchbill calculations.
+Kernels are compiled with numba when it is installed; otherwise equivalent vectorized
+NumPy versions are used so the calculations never fall back to per-element Python loops.
+"""
+import numpy as np
+from src.constants import AVAILABLE_CODES, BODY_KEY
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback for numba.njit that returns the function uncompiled."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+    prange = range
+
+# True for each BODY_KEY code in AVAILABLE_CODES, indexed by code; the single table every
+# availability count reads, so changing AVAILABLE_CODES changes them all
+AVAILABLE_TABLE = np.zeros(max(BODY_KEY) + 1, dtype=np.bool_)
+AVAILABLE_TABLE[sorted(AVAILABLE_CODES)] = True
+AVAILABLE_TABLE.setflags(write=False)
+
+
+def count_available(vecs):
+    """
+    Count the days each watchstander is available for duty (AVAILABLE_CODES).
+    
+    Args:
+        vecs: 2-D int8 availability matrix, one row per watchstander
+        
+    Returns:
+        int32 array holding the available day count of each row
+    """
+    return _count_available_kernel(vecs, AVAILABLE_TABLE)
+
+
+@njit(cache=True, fastmath=True)
+def _count_available_kernel(vecs, available_table):
+    """Count the days of each row whose code is marked in available_table; other codes are unavailable."""
+    n, days = vecs.shape
+    n_codes = available_table.shape[0]
+    out = np.zeros(n, dtype=np.int32)
+    for i in range(n):
+        s = 0
+        for j in range(days):
+            v = vecs[i, j]
+            if v >= 0 and v < n_codes and available_table[v]:
+                s += 1
+        out[i] = s
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def monthly_points_kernel(day_types, points_per_day_type):
+    """
+    Sum the watch points to be stood in a month.
+    
+    Args:
+        day_types: int8 month vector, one day type per day
+        points_per_day_type: float64 points of one day of each day type
+        
+    Returns:
+        Total points; days with a day type outside the table add nothing
+    """
+    total = 0.0
+    n_types = points_per_day_type.shape[0]
+    for i in range(day_types.shape[0]):
+        t = day_types[i]
+        if t >= 0 and t < n_types:
+            total += points_per_day_type[t]
+    return total
+
+
+@njit(parallel=True, cache=True)
+def expected_points_kernel(avail, day_pts, night_pts, is_n_head, watch_pct, total_monthly_points, n_head_points_each):
+    """
+    Calculate expected and actual watch points for every watchstander in a month.
+    
+    Args:
+        avail: 2-D int8 availability matrix, one row per watchstander
+        day_pts: Points of a day watch on each day of the month
+        night_pts: Points of a night watch on each day of the month
+        is_n_head: Boolean N-head flag of each row
+        watch_pct: Watch percentage of each row
+        total_monthly_points: Total watch points to be stood in the month
+        n_head_points_each: Expected points of a fully available N-head
+        
+    Returns:
+        Tuple of float64 arrays (expected_points, actual_points), one entry per row
+    """
+    n, days = avail.shape
+    availability_pct = np.zeros(n)
+    actual = np.zeros(n)
+    # N-heads take a fixed share; the rest is split by availability and watch percentage.
+    # Both totals are reductions accumulated in the same pass that reads the matrix.
+    n_head_points = 0.0
+    total_watch_pct = 0.0
+    # Each iteration only writes row i, so rows can be processed in parallel
+    for i in prange(n):
+        present = 0
+        stood = 0.0
+        for j in range(days):
+            v = avail[i, j]
+            if v > 0:
+                present += 1
+            if v == 8:  # Day watch
+                stood += day_pts[j]
+            elif v == 9:  # Night watch
+                stood += night_pts[j]
+        pct = present / days if days > 0 else 0.0
+        availability_pct[i] = pct
+        actual[i] = stood
+        if is_n_head[i]:
+            n_head_points += pct * n_head_points_each
+        else:
+            total_watch_pct += pct * watch_pct[i]
+    remaining_points = total_monthly_points - n_head_points
+
+    expected = np.zeros(n)
+    for i in prange(n):
+        if is_n_head[i]:
+            expected[i] = availability_pct[i] * n_head_points_each
+        elif total_watch_pct > 0:
+            expected[i] = (availability_pct[i] * watch_pct[i]) / total_watch_pct * remaining_points
+    return expected, actual
+
+
+@njit(parallel=True, cache=True)
+def watchbill_rules_kernel(wb, unavailable_mask, is_n_head, day_types):
+    """
+    Check a watchbill against the per-day scheduling rules in one pass over the matrix.
+    
+    Args:
+        wb: 2-D int8 watchbill, one row per watchstander (1: day watch, 2: night watch)
+        unavailable_mask: Boolean table of the codes that make a person unavailable
+        is_n_head: Boolean N-head flag of each row
+        day_types: Month vector day type of each column
+        
+    Returns:
+        Tuple (rule1, rule_counts, watch_counts): a boolean matrix of Rule 1 violations,
+        an int32 (rows, 4) array counting Rule 2-5 violations per row and the number
+        of watches assigned to each row
+    """
+    n, days = wb.shape
+    rule1 = np.zeros((n, days), dtype=np.bool_)
+    rule_counts = np.zeros((n, 4), dtype=np.int32)
+    watch_counts = np.zeros(n, dtype=np.int32)
+    # Each iteration only writes row i, so rows can be processed in parallel
+    for i in prange(n):
+        for j in range(days):
+            v = wb[i, j]
+            if v != 0:
+                watch_counts[i] += 1
+            if is_n_head[i] and v == 1 and day_types[j] != 0:  # Rule 1: Day watch on non-workday
+                rule1[i, j] = True
+            if v < 0 or v >= unavailable_mask.shape[0] or not unavailable_mask[v]:
+                continue
+            if j + 1 < days and wb[i, j + 1] != 0:  # Rule 2: Watch before leave
+                rule_counts[i, 0] += 1
+            if j + 2 < days and wb[i, j + 2] == 1:  # Rule 3: Day watch two days before leave
+                rule_counts[i, 1] += 1
+            if j > 0 and wb[i, j - 1] != 0:  # Rule 4: Watch after leave
+                rule_counts[i, 2] += 1
+            if j > 0 and wb[i, j - 1] == 1:  # Rule 5: Day watch the day after leave
+                rule_counts[i, 3] += 1
+    return rule1, rule_counts, watch_counts
+
+
+def _count_available_numpy(vecs, available_table):
+    """NumPy version of _count_available_kernel."""
+    in_range = (vecs >= 0) & (vecs < len(available_table))
+    available = in_range & available_table[np.where(in_range, vecs, 0)]
+    return np.count_nonzero(available, axis=1).astype(np.int32)
+
+
+def _monthly_points_numpy(day_types, points_per_day_type):
+    """NumPy version of monthly_points_kernel."""
+    known = (day_types >= 0) & (day_types < len(points_per_day_type))
+    return float(points_per_day_type[day_types[known]].sum())
+
+
+def _expected_points_numpy(avail, day_pts, night_pts, is_n_head, watch_pct, total_monthly_points, n_head_points_each):
+    """NumPy version of expected_points_kernel."""
+    n, days = avail.shape
+    if days > 0:
+        availability_pct = np.count_nonzero(avail > 0, axis=1) / days
+    else:
+        availability_pct = np.zeros(n)
+    actual = np.where(avail == 8, day_pts, 0.0).sum(axis=1) + np.where(avail == 9, night_pts, 0.0).sum(axis=1)
+
+    n_head_expected = availability_pct * n_head_points_each
+    weighted_pct = availability_pct * watch_pct
+    remaining_points = total_monthly_points - n_head_expected[is_n_head].sum()
+    total_watch_pct = weighted_pct[~is_n_head].sum()
+    if total_watch_pct > 0:
+        others_expected = weighted_pct / total_watch_pct * remaining_points
+    else:
+        others_expected = np.zeros(n)
+    expected = np.where(is_n_head, n_head_expected, others_expected)
+    return expected, actual
+
+
+def _watchbill_rules_numpy(wb, unavailable_mask, is_n_head, day_types):
+    """NumPy version of watchbill_rules_kernel."""
+    n, days = wb.shape
+    in_range = (wb >= 0) & (wb < len(unavailable_mask))
+    unavail = in_range & unavailable_mask[np.where(in_range, wb, 0)]
+    rule1 = is_n_head[:, None] & (wb == 1) & (day_types != 0)[None, :]
+    rule_counts = np.zeros((n, 4), dtype=np.int32)
+    rule_counts[:, 0] = (unavail[:, :-1] & (wb[:, 1:] != 0)).sum(axis=1)
+    rule_counts[:, 1] = (unavail[:, :-2] & (wb[:, 2:] == 1)).sum(axis=1)
+    rule_counts[:, 2] = (unavail[:, 1:] & (wb[:, :-1] != 0)).sum(axis=1)
+    rule_counts[:, 3] = (unavail[:, 1:] & (wb[:, :-1] == 1)).sum(axis=1)
+    watch_counts = np.count_nonzero(wb, axis=1).astype(np.int32)
+    return rule1, rule_counts, watch_counts
+
+
+if not NUMBA_AVAILABLE:
+    _count_available_kernel = _count_available_numpy
+    expected_points_kernel = _expected_points_numpy
+    monthly_points_kernel = _monthly_points_numpy
+    watchbill_rules_kernel = _watchbill_rules_numpy
@@ -49,6 +49,9 @@ BODY_KEY = {
     9: "STWO Night Watch"
 }
 
+# BODY_KEY codes for days a person counts as available for duty
+AVAILABLE_CODES = frozenset({0, 4, 5, 6, 7, 8, 9})
+
 # Value Key
 VALUE_KEY = {
     "Working hour": 0.75,
@@ -67,6 +70,14 @@ VALUE_KEY = {
     "Expected SWO watch": 18
 }
 
+# Watch points indexed by [day_type, watch] where watch 0 is day and 1 is night
+WATCH_POINTS = (
+    (VALUE_KEY["Weekday day watch"], VALUE_KEY["Weekday night watch"]),  # Workday
+    (VALUE_KEY["Friday day watch"], VALUE_KEY["Friday night/Saturday/Sunday day"]),  # Leading into weekend
+    (VALUE_KEY["Friday night/Saturday/Sunday day"], VALUE_KEY["Friday night/Saturday/Sunday day"]),  # Weekend day
+    (VALUE_KEY["Friday night/Saturday/Sunday day"], VALUE_KEY["Sunday night"]),  # Final weekend day
+)
+
 # Rules
 RULES = {
     1: "N3, N4, N5, N7 can only stand weekday day watches",
@@ -1,24 +1,41 @@
 """
 Module for database configuration and models.
 """
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, DateTime, JSON
+import json
+import struct
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+import numpy as np
+from sqlalchemy import case, create_engine, func, inspect, select, text, Column, Integer, String, Boolean, DateTime, JSON, LargeBinary
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session as SessionType, sessionmaker
 from datetime import datetime
-from typing import List, Dict, Tuple
+from typing import Iterator, List, Dict, Optional, Tuple
+from src._kernels import AVAILABLE_TABLE
 
-# Create SQLite database engine
-engine = create_engine('sqlite:///watchbill.db')
+# Create SQLite database engine; a small pool lets FastAPI's worker threads share connections
+# (pool_size needs SQLAlchemy 2.0, which pools SQLite file connections with QueuePool)
+engine = create_engine(
+    'sqlite:///watchbill.db',
+    connect_args={'check_same_thread': False},
+    pool_size=5,
+)
 Base = declarative_base()
 
+# Header of each month in availability_blobs: year, month and number of days
+_BLOB_HEADER = struct.Struct('<HBB')
+
 class WatchstanderDB(Base):
     """Database model for Watchstander."""
     __tablename__ = 'watchstanders'
 
     id = Column(Integer, primary_key=True)
-    name = Column(String, nullable=False)
+    name = Column(String, nullable=False, unique=True, index=True)  # Saves and loads look watchstanders up by name
     is_n_head = Column(Boolean, nullable=False)
-    availability_vectors = Column(JSON)  # Store monthly vectors as JSON
+    availability_vectors = Column(JSON)  # Legacy "YYYY-MM" -> vector JSON, only read for rows without availability_blobs
+    availability_blobs = Column(LargeBinary)  # Monthly vectors packed as int8 days (see pack_availability_vectors)
 
     def __repr__(self):
         return f"<WatchstanderDB(name='{self.name}', is_n_head={self.is_n_head})>"
@@ -26,41 +43,150 @@ class WatchstanderDB(Base):
 # Create all tables
 Base.metadata.create_all(engine)
 
-# Create session factory
-Session = sessionmaker(bind=engine)
+def _migrate_schema() -> None:
+    """Add columns and indexes introduced after a database file was created."""
+    table = WatchstanderDB.__tablename__
+    inspector = inspect(engine)
+    columns = {column['name'] for column in inspector.get_columns(table)}
+    if 'availability_blobs' not in columns:
+        with engine.begin() as conn:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN availability_blobs BLOB"))
+    if not any(index['column_names'] == ['name'] for index in inspector.get_indexes(table)):
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(f"CREATE UNIQUE INDEX ix_{table}_name ON {table} (name)"))
+        except IntegrityError:
+            pass  # Older files may hold duplicate names; lookups still work without the index
+
+_migrate_schema()
+
+def pack_availability_vectors(vectors: Dict[Tuple[int, int], List[int]]) -> bytes:
+    """Pack (year, month) -> vector availability into bytes: a header per month followed by one int8 per day."""
+    return b"".join(
+        _BLOB_HEADER.pack(year, month, len(vector)) + np.asarray(vector, dtype=np.int8).tobytes()
+        for (year, month), vector in vectors.items()
+    )
+
+def unpack_availability_vectors(blob: bytes) -> Dict[Tuple[int, int], np.ndarray]:
+    """Inverse of pack_availability_vectors; each vector is a read-only int8 view of the blob."""
+    vectors = {}
+    offset = 0
+    while offset < len(blob):
+        year, month, n_days = _BLOB_HEADER.unpack_from(blob, offset)
+        offset += _BLOB_HEADER.size
+        vectors[(year, month)] = np.frombuffer(blob, dtype=np.int8, count=n_days, offset=offset)
+        offset += n_days
+    return vectors
+
+# Create session factory; objects stay readable after the session that loaded them closes
+Session = sessionmaker(bind=engine, expire_on_commit=False)
 
 def get_db_session():
     """Get a new database session."""
     return Session()
 
-def get_all_watchstanders() -> List[WatchstanderDB]:
-    """Get all watchstanders from the database."""
-    session = get_db_session()
+@contextmanager
+def db_session() -> Iterator[SessionType]:
+    """Provide a session that commits on success, rolls back on error and always closes."""
+    session = Session()
     try:
-        return session.query(WatchstanderDB).all()
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
     finally:
         session.close()
 
-def calculate_total_availability(year: int, month: int) -> Tuple[int, Dict[str, int]]:
+def get_all_watchstanders(session: Optional[SessionType] = None) -> List[WatchstanderDB]:
+    """Get all watchstanders from the database, using the given session if one is passed."""
+    if session is None:
+        with db_session() as session:
+            return get_all_watchstanders(session)
+    return session.query(WatchstanderDB).all()
+
+def calculate_total_availability(year: int, month: int, session: Optional[SessionType] = None) -> Tuple[int, Dict[str, int]]:
     """
     Calculate total available days for all watchstanders in a given month.
     Returns a tuple of (total_available_days, individual_available_days)
     where individual_available_days is a dict mapping watchstander names to their available days.
+    Without an explicit session the result is cached until the database is next written,
+    by this process or any other, or clear_availability_cache() is called.
     """
-    session = get_db_session()
-    try:
-        watchstanders = session.query(WatchstanderDB).all()
-        month_key = (year, month)
-        total_available = 0
-        individual_available = {}
-
-        for ws in watchstanders:
-            if month_key in ws.availability_vectors:
-                vector = ws.availability_vectors[month_key]
-                available_days = sum(1 for day in vector if day in [0, 4, 5, 6, 7, 8, 9])
-                individual_available[ws.name] = available_days
-                total_available += available_days
-
-        return total_available, individual_available
-    finally:
-        session.close() 
\ No newline at end of file
+    if session is None:
+        total_available, individual_available = _cached_total_availability(year, month, _data_version())
+        return total_available, dict(individual_available)
+    return _total_availability(session, year, month)
+
+def calculate_total_available_days(year: int, month: int) -> int:
+    """Total available days of all watchstanders in a month, from the calculate_total_availability cache."""
+    return _cached_total_availability(year, month, _data_version())[0]
+
+# Connection that only ever reads PRAGMA data_version; see _data_version
+_version_conn = None
+_version_lock = threading.Lock()
+
+def _data_version() -> Tuple[int, int]:
+    """
+    Key that changes whenever another connection or process commits to the database.
+    SQLite changes a connection's data_version after every commit made by any other
+    connection, so a connection kept only for reading it sees every write.
+    """
+    global _version_conn
+    with _version_lock:
+        if _version_conn is None or _version_conn[0] is not engine:
+            _version_conn = (engine, engine.raw_connection())
+        cursor = _version_conn[1].cursor()
+        try:
+            cursor.execute("PRAGMA data_version")
+            version = cursor.fetchone()[0]
+        finally:
+            cursor.close()
+        return id(engine), version
+
+@lru_cache(maxsize=64)
+def _cached_total_availability(year: int, month: int, data_version: Tuple[int, int]) -> Tuple[int, Dict[str, int]]:
+    """Compute calculate_total_availability in its own session, memoized per (year, month) and database version."""
+    with db_session() as session:
+        return _total_availability(session, year, month)
+
+def clear_availability_cache() -> None:
+    """Forget cached availability totals; call after writing watchstanders to the database."""
+    _cached_total_availability.cache_clear()
+
+def _count_available(vector: List[int]) -> int:
+    """Count the days of a vector whose code is marked in AVAILABLE_TABLE."""
+    codes = np.asarray(vector, dtype=np.int64)
+    in_range = (codes >= 0) & (codes < len(AVAILABLE_TABLE))
+    return int(np.count_nonzero(in_range & AVAILABLE_TABLE[np.where(in_range, codes, 0)]))
+
+def _total_availability(session: SessionType, year: int, month: int) -> Tuple[int, Dict[str, int]]:
+    """Query the available days of every watchstander for a month."""
+    # Rows saved before availability_blobs existed only have JSON under "YYYY-MM" keys;
+    # for those, let SQLite pull out just this month rather than decoding every stored month
+    month_key = f"{year}-{month:02d}"
+    stmt = select(
+        WatchstanderDB.name,
+        WatchstanderDB.availability_blobs,
+        case(
+            (WatchstanderDB.availability_blobs.is_(None),
+             func.json_extract(WatchstanderDB.availability_vectors, f'$."{month_key}"')),
+        ).label('vec'),
+    )
+    total_available = 0
+    individual_available = {}
+
+    for name, blob, vec_json in session.execute(stmt):
+        if blob is not None:
+            vector = unpack_availability_vectors(blob).get((year, month))
+        elif vec_json is not None:
+            vector = json.loads(vec_json)
+        else:
+            vector = None
+        if vector is None:
+            continue
+        available_days = _count_available(vector)
+        individual_available[name] = available_days
+        total_available += available_days
+
+    return total_available, individual_available
@@ -1,13 +1,48 @@
 """
 Module for handling Word document operations.
 """
-import docx
+import zipfile
+import xml.etree.ElementTree as ET
+
+# WordprocessingML namespace used for every element in word/document.xml
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
 
 def read_docx(file_path: str) -> str:
-    """Read a Word document and return its text content."""
+    """
+    Read a Word document and return its text content, one line per body paragraph.
+    The document XML is streamed with iterparse and each paragraph is cleared once
+    its text has been collected, so the full document tree is never kept in memory.
+    Only run text (w:t), tabs (w:tab) and breaks (w:br, w:cr) are collected, and every break
+    becomes a newline. Runs inside tracked insertions (w:ins) are included and page or column
+    breaks are not dropped, so the text can differ from python-docx's paragraph text for
+    documents that use them. Paragraphs nested in tables are skipped.
+    """
     try:
-        doc = docx.Document(file_path)
-        return '\n'.join([paragraph.text for paragraph in doc.paragraphs])
+        paragraphs = []
+        tags = []  # Tags of the currently open elements
+        texts = []  # Text collected for each open paragraph
+        with zipfile.ZipFile(file_path) as z, z.open('word/document.xml') as f:
+            for event, el in ET.iterparse(f, events=('start', 'end')):
+                if event == 'start':
+                    tags.append(el.tag)
+                    if el.tag == _W + 'p':
+                        texts.append([])
+                    continue
+                tags.pop()
+                parent = tags[-1] if tags else None
+                if el.tag == _W + 'p':
+                    text = ''.join(texts.pop())
+                    if parent == _W + 'body':
+                        paragraphs.append(text)
+                    el.clear()
+                elif texts and parent == _W + 'r':
+                    if el.tag == _W + 't':
+                        texts[-1].append(el.text or '')
+                    elif el.tag == _W + 'tab':
+                        texts[-1].append('\t')
+                    elif el.tag in (_W + 'br', _W + 'cr'):
+                        texts[-1].append('\n')
+        return '\n'.join(paragraphs)
     except Exception as e:
         raise Exception(f"Error reading Word document: {str(e)}")
 
@@ -16,4 +51,4 @@ if __name__ == "__main__":
         content = read_docx("Pseudo code- watchbill model.docx")
         print(content)
     except Exception as e:
-        print(f"Error: {str(e)}") 
\ No newline at end of file
+        print(f"Error: {str(e)}")
@@ -1,8 +1,29 @@
 """
 Module for handling Excel file operations.
 """
-import pandas as pd
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, Optional
+from openpyxl import load_workbook
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+def iter_sheet_rows(file_path, sheet_name: Optional[str] = None) -> Iterator[tuple]:
+    """
+    Stream the rows of a worksheet as tuples of cell values.
+    The workbook is opened read-only so rows are parsed one at a time instead of
+    loading the whole sheet into memory. Reads the first sheet if no name is given.
+    """
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        yield from _worksheet_rows(wb, sheet_name)
+    finally:
+        wb.close()
+
+def _worksheet_rows(wb, sheet_name: Optional[str] = None) -> Iterator[tuple]:
+    """Iterate the cell values of a sheet (the first one by default) of an open workbook."""
+    ws = wb[sheet_name] if sheet_name else wb.worksheets[0]
+    return ws.iter_rows(values_only=True)
 
 class ExcelHandler:
     def __init__(self, file_path: str = "TROOP TO TASK - Watchbill Working Document.xlsx"):
@@ -10,25 +31,49 @@ class ExcelHandler:
         self.file_path = Path(file_path)
         if not self.file_path.exists():
             raise FileNotFoundError(f"Excel file not found at {file_path}")
+        self._workbook = None
+
+    @property
+    def _wb(self):
+        """Read-only workbook, opened on first use and shared by every read."""
+        if self._workbook is None:
+            self._workbook = load_workbook(self.file_path, read_only=True, data_only=True)
+        return self._workbook
+
+    def close(self) -> None:
+        """Close the underlying workbook if it has been opened."""
+        if self._workbook is not None:
+            self._workbook.close()
+            self._workbook = None
+
+    def __enter__(self) -> "ExcelHandler":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
         
-    def read_excel(self, sheet_name: str = None) -> pd.DataFrame:
+    def read_excel(self, sheet_name: str = None) -> "pd.DataFrame":
         """Read the Excel file and return a pandas DataFrame."""
+        import pandas as pd
         try:
-            if sheet_name:
-                return pd.read_excel(self.file_path, sheet_name=sheet_name)
-            return pd.read_excel(self.file_path)
+            rows = _worksheet_rows(self._wb, sheet_name)
+            header = next(rows, None)
+            if header is None:
+                return pd.DataFrame()
+            return pd.DataFrame(list(rows), columns=header)
         except Exception as e:
             raise Exception(f"Error reading Excel file: {str(e)}")
     
     def get_sheet_names(self) -> list:
         """Get all sheet names from the Excel file."""
         try:
-            return pd.ExcelFile(self.file_path).sheet_names
+            return self._wb.sheetnames
         except Exception as e:
             raise Exception(f"Error getting sheet names: {str(e)}")
 
 def read_excel_file(file_path):
     """Read the Excel file and return the available sheets."""
+    import pandas as pd
     try:
         xls = pd.ExcelFile(file_path)
         sheets = xls.sheet_names
@@ -45,6 +90,7 @@ def read_excel_file(file_path):
 
 def main():
     """Main function to test the Excel handler."""
+    import pandas as pd
     file_path = "TROOP TO TASK - Watchbill Working Document.xlsx"
     sheets = read_excel_file(file_path)
     if sheets:
@@ -1,11 +1,18 @@
+import logging
+import re
 import sys
-import pandas as pd
-from src.month import Month
+from src.excel_handler import iter_sheet_rows
+from src.month import Month, availability_block
 from src.watchstander import Watchstander
 from src.constants import BODY_KEY
 from typing import List
 import argparse
 
+logger = logging.getLogger(__name__)
+
+# Tab separator of a pasted table, absorbing any spaces around it
+_TAB_SPLIT = re.compile(r'\s*\t\s*')
+
 def build_month_from_excel(filepath, year, month, n_heads=None):
     """
     Build a Month object from an Excel file for the given year and month.
@@ -17,29 +24,39 @@ def build_month_from_excel(filepath, year, month, n_heads=None):
     Returns:
         Month: Populated Month object
     """
-    df = pd.read_excel(filepath)
-    if df.empty:
-        raise ValueError("Excel file is empty or not found.")
-    
     # Assume first row is header, first column is name, rest are availability
+    rows = iter_sheet_rows(filepath)
+    next(rows, None)  # Skip the header row
+    names = []
+    cells = []
+    has_rows = False
+    for row in rows:
+        has_rows = True
+        name = row[0] if row else None
+        if name is None:
+            continue
+        names.append(name)
+        cells.append(row[1:])
+    if not has_rows:
+        raise ValueError("Excel file is empty or not found.")
     month_obj = Month(year, month)
+    # Check and cast the whole availability block at once
+    vecs = availability_block(names, cells, month_obj.days_in_month)
     n_heads = set(n_heads) if n_heads else set()
-    for _, row in df.iterrows():
-        name = row.iloc[0]
-        if pd.isna(name):
-            continue
+    for i, name in enumerate(names):
         is_n_head = name in n_heads
-        # Fill NaN with 0 in the availability vector
-        availability_vector = [int(x) if not pd.isna(x) else 0 for x in row.iloc[1:]]
-        print(f"Watchstander: {name}, Availability Vector: {availability_vector}")  # Debug print
+        availability_vector = vecs[i].tolist()
+        logger.debug("Watchstander: %s, Availability Vector: %s", name, availability_vector)
         # Check if the watchstander already exists
-        existing_watchstander = next((w for w in month_obj.watchstanders if w.name == name), None)
+        existing_watchstander = month_obj.get_watchstander(name)
         if existing_watchstander:
-            existing_watchstander.set_monthly_availability(year, month, availability_vector)
+            month_obj.set_watchstander_availability(name, availability_vector, defer_save=True)
         else:
             ws = Watchstander(name=name, is_n_head=is_n_head)
-            ws.set_monthly_availability(year, month, availability_vector)
+            ws.set_monthly_availability(year, month, availability_vector, defer_save=True)
             month_obj.add_watchstander(ws)
+    # Save the whole roster in one transaction
+    Watchstander.bulk_flush(month_obj.watchstanders.values())
     return month_obj
 
 def build_month_from_table(table_text: str, year: int, month: int, n_heads: List[str]) -> Month:
@@ -55,37 +72,64 @@ def build_month_from_table(table_text: str, year: int, month: int, n_heads: List
     Returns:
         Month: The constructed Month object.
     """
-    month_obj = Month(year, month)
-    lines = table_text.strip().split('\n')
-    for line in lines:
-        parts = line.strip().split('\t')
+    names = []
+    rows = []
+    for line in table_text.strip().split('\n'):
+        parts = _TAB_SPLIT.split(line.strip())
         if len(parts) >= 2:
-            name = parts[0].strip()
-            availability_vector = [int(part.strip()) for part in parts[1:]]
-            # Check if the watchstander already exists
-            existing_watchstander = next((w for w in month_obj.watchstanders if w.name == name), None)
-            if existing_watchstander:
-                existing_watchstander.set_monthly_availability(year, month, availability_vector)
-            else:
-                watchstander = Watchstander(name, name in n_heads)
-                watchstander.set_monthly_availability(year, month, availability_vector)
-                month_obj.add_watchstander(watchstander)
+            names.append(parts[0])
+            rows.append(parts[1:])
+    month_obj = Month(year, month)
+    # Check and convert every cell of the table to int8 in a single cast
+    matrix = availability_block(names, rows, month_obj.days_in_month)
+    n_heads = set(n_heads)
+    for name, vec in zip(names, matrix):
+        availability_vector = vec.tolist()
+        # Check if the watchstander already exists
+        existing_watchstander = month_obj.get_watchstander(name)
+        if existing_watchstander:
+            month_obj.set_watchstander_availability(name, availability_vector, defer_save=True)
+        else:
+            watchstander = Watchstander(name, name in n_heads)
+            watchstander.set_monthly_availability(year, month, availability_vector, defer_save=True)
+            month_obj.add_watchstander(watchstander)
+    # Save the whole roster in one transaction
+    Watchstander.bulk_flush(month_obj.watchstanders.values())
     return month_obj
 
+def _points_table(summary):
+    """
+    Build one table of expected, actual and deviation points per watchstander.
+    Args:
+        summary (dict): Output of Month.get_month_summary()
+    Returns:
+        pd.DataFrame: Indexed by watchstander name
+    """
+    import pandas as pd
+
+    df = pd.DataFrame(list(summary['expected_points'].items()), columns=['name', 'expected']).set_index('name')
+    df['actual'] = pd.Series(summary['actual_points'], dtype=float)
+    df['deviation'] = df['actual'] - df['expected']
+    return df
+
+def _print_points_table(df):
+    """Print the per-watchstander points table."""
+    print('\nWatchstander Breakdown:\n' + df.to_string(float_format=lambda x: f'{x:6.1f}'))
+
 def print_month_summary(month_obj):
     """
     Print a summary of the month.
     Args:
         month_obj (Month): The Month object
     """
-    summary = month_obj.get_month_summary()
-    print(f"\n=== {month_obj.year}-{month_obj.month:02d} Watchbill Summary ===")
-    print(f"Total Watchstanders: {len(month_obj.watchstanders)}")
-    print(f"Total Expected Points: {sum(summary['expected_points'].values()):.1f}")
-    print(f"Total Actual Points: {sum(summary['actual_points'].values()):.1f}")
-    print("\nWatchstander Breakdown:")
-    for name in summary['expected_points']:
-        print(f"{name:20}  Expected: {summary['expected_points'][name]:6.1f}  Actual: {summary['actual_points'][name]:6.1f}  Deviation: {summary['actual_points'][name] - summary['expected_points'][name]:+6.1f}")
+    df = _points_table(month_obj.get_month_summary())
+    print("\n".join([
+        f"\n=== {month_obj.year}-{month_obj.month:02d} Watchbill Summary ===",
+        f"Total Watchstanders: {len(month_obj.watchstanders)}",
+        f"Total Expected Points: {df['expected'].sum():.1f}",
+        f"Total Actual Points: {df['actual'].sum():.1f}",
+    ]))
+    _print_points_table(df)
 
 def print_watchstander_points(month_obj):
     """
@@ -93,10 +137,7 @@ def print_watchstander_points(month_obj):
     Args:
         month_obj (Month): The Month object
     """
-    summary = month_obj.get_month_summary()
-    print('\nWatchstander Breakdown:')
-    for name in summary['expected_points']:
-        print(f'{name:20}  Expected: {summary["expected_points"][name]:6.1f}  Actual: {summary["actual_points"][name]:6.1f}  Deviation: {summary["actual_points"][name] - summary["expected_points"][name]:+6.1f}')
+    _print_points_table(_points_table(month_obj.get_month_summary()))
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Import watchbill data from a file.')
@@ -1,8 +1,10 @@
 """
 Main application module for Watchbill CDS7.
 """
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.orm import Session
+from src.database import db_session, get_all_watchstanders
 
 app = FastAPI(
     title="Watchbill CDS7",
@@ -19,11 +21,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def get_db():
+    """Yield one database session for the lifetime of a request."""
+    with db_session() as session:
+        yield session
+
 @app.get("/")
 async def root():
     """Root endpoint."""
     return {"message": "Welcome to Watchbill CDS7 API"}
 
+@app.get("/watchstanders")
+def list_watchstanders(session: Session = Depends(get_db)):
+    """List all stored watchstanders."""
+    return [
+        {"name": ws.name, "is_n_head": ws.is_n_head}
+        for ws in get_all_watchstanders(session)
+    ]
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
@@ -2,16 +2,115 @@
 Module for managing watchstanders and their assignments for a specific month.
 """
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+from functools import lru_cache
+from typing import List, Dict, Optional, Sequence, Tuple
 from src.watchstander import Watchstander
 from src.month_vector_generator import generate_month_vector
-from src.constants import VALUE_KEY
-import pandas as pd
+from src.constants import BODY_KEY, WATCH_POINTS
+from src.excel_handler import iter_sheet_rows
+from src._kernels import count_available, expected_points_kernel
 import matplotlib.pyplot as plt
+import numpy as np
 import re
 import calendar
 
+# Watch points indexed by [day_type, watch] where watch 0 is 'D' and 1 is 'N'
+_POINTS = np.array(WATCH_POINTS, dtype=np.float64)
+
+# Points one day of each day type adds to the month's total; a weekend day
+# counts a single watch
+_TOTAL_PER_DAYTYPE = np.array([
+    _POINTS[0].sum(),  # Full workday
+    _POINTS[1].sum(),  # Leading into weekend
+    _POINTS[2, 0],  # Weekend day
+    _POINTS[3].sum(),  # Final day of weekend
+], dtype=np.float64)
+
+# The same points as plain floats indexed by [watch][day_type], for scalar lookups
+# that would otherwise pay NumPy's per-element indexing overhead
+_PTS = tuple(tuple(column) for column in _POINTS.T.tolist())
+
+@lru_cache(maxsize=256)
+def _month_vector(year: int, month: int) -> np.ndarray:
+    """
+    Generate the month vector for a year and month once and cache it.
+    The array is read-only so no Month can modify the cached copy; use .copy() to get a writable one.
+    """
+    vector = np.asarray(generate_month_vector(year, month), dtype=np.int8)
+    vector.setflags(write=False)
+    return vector
+
+def availability_block(names: Sequence[str], rows: Sequence[Sequence], days_in_month: int) -> np.ndarray:
+    """
+    Cast the availability rows of a roster to one int8 matrix, one row per name.
+    Every row must have one cell per day holding a BODY_KEY code; empty cells count as 0.
+    """
+    for name, row in zip(names, rows):
+        if not row or len(row) != days_in_month:
+            raise ValueError(f"Watchstander {name} must have a filled availability vector of length {days_in_month}.")
+    try:
+        # Empty cells become NaN and then 0
+        block = np.nan_to_num(np.array(rows, dtype=float).reshape(len(rows), days_in_month))
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid availability values: {e}") from e
+    invalid = np.argwhere(~np.isin(block, list(BODY_KEY)))
+    if len(invalid):
+        row, day = invalid[0]
+        raise ValueError(f"Watchstander {names[row]} has invalid availability code {block[row, day]:g} on day {day + 1}.")
+    return block.astype(np.int8)
+
+class MonthAvailabilityMatrix:
+    """
+    Availability of a month's roster stored struct-of-arrays style: one int8 matrix A of
+    shape (n_watchstanders, n_days) plus a name -> row index.
+    Rows are copies of the vectors they were given, so later changes to a watchstander's
+    own vectors are not seen here until the row is set again.
+    """
+    def __init__(self, year: int, month: int, names: Sequence[str] = (), n_days: Optional[int] = None):
+        self.year = year
+        self.month = month
+        if n_days is None:
+            n_days = calendar.monthrange(year, month)[1]
+        self.A = np.zeros((len(names), n_days), dtype=np.int8)
+        self.name_idx: Dict[str, int] = {name: i for i, name in enumerate(names)}
+
+    def __len__(self) -> int:
+        return len(self.name_idx)
+
+    @property
+    def names(self) -> List[str]:
+        """Names of the rows, in row order."""
+        return list(self.name_idx)
+
+    def append(self, name: str, availability_vector) -> None:
+        """Add a row for a watchstander."""
+        self.name_idx[name] = len(self.name_idx)
+        self.A = np.vstack([self.A, np.asarray(availability_vector, dtype=np.int8)])
+
+    def remove(self, name: str) -> None:
+        """Drop a watchstander's row; later rows move up by one."""
+        idx = self.name_idx.pop(name)
+        self.A = np.delete(self.A, idx, axis=0)
+        for other, row in self.name_idx.items():
+            if row > idx:
+                self.name_idx[other] = row - 1
+
+    def set_row(self, name: str, availability_vector) -> None:
+        """Overwrite a watchstander's row."""
+        self.A[self.name_idx[name]] = availability_vector
+
+    def row(self, name: str) -> np.ndarray:
+        """A watchstander's availability row of the matrix."""
+        return self.A[self.name_idx[name]]
+
+    def available_days(self) -> Dict[str, int]:
+        """Available days (AVAILABLE_CODES) of every row, in one reduction."""
+        return {name: int(days) for name, days in zip(self.name_idx, count_available(self.A))}
+
 class Month:
+    # Runs of whitespace collapsed by normalize_name
+    _WS_RE = re.compile(r'\s+')
+
     def __init__(self, year: int, month: int):
         """
         Initialize a Month object.
@@ -23,22 +122,42 @@ class Month:
         self.year = year
         self.month = month
         self.watchstanders: Dict[str, Watchstander] = {}
-        self.month_vector = generate_month_vector(year, month)
+        self.month_vector = _month_vector(year, month)
+        # Day and night watch points of each day of the month, looked up once from the day types
+        self._day_pts_by_day = _POINTS[self.month_vector, 0]
+        self._night_pts_by_day = _POINTS[self.month_vector, 1]
+        # Total watch points to be stood in the month; fixed by the day types
+        self._total_monthly_points = float(np.bincount(self.month_vector, minlength=4) @ _TOTAL_PER_DAYTYPE)
         self.actual_watch_points: Dict[str, float] = {}  # Track actual watch points for each watchstander
+        # Result of _compute_expected, cleared whenever the roster, watches or a rostered watchstander change
+        self._expected_cache: Optional[Tuple[Dict[str, float], Dict[str, float]]] = None
         # Calculate the number of days in the month
         self.days_in_month = calendar.monthrange(year, month)[1]
+        # Availability of the roster for this month, one int8 row per watchstander in roster order
+        self._availability = MonthAvailabilityMatrix(year, month, n_days=self.days_in_month)
+        self._n_head_flags: Dict[str, bool] = {}  # N-head flag of each rostered watchstander
+        # Availability vector object and watch percentage each row was last computed from;
+        # Watchstander replaces its read-only vectors when they change, so identity shows a change
+        self._synced_vectors: Dict[str, np.ndarray] = {}
+        self._watch_pcts: Dict[str, float] = {}
         
     def add_watchstander(self, watchstander: Watchstander) -> None:
         """Add a watchstander to the month."""
         if watchstander.name in self.watchstanders:
             raise ValueError(f"Watchstander {watchstander.name} already exists in the month.")
         # Ensure availability vector is filled and has the correct length
-        if not watchstander.availability_vectors.get((self.year, self.month), []):
+        vector = watchstander.get_monthly_availability(self.year, self.month)
+        if vector is None or len(vector) == 0:
             raise ValueError(f"Watchstander {watchstander.name} must have a filled availability vector.")
-        if len(watchstander.availability_vectors.get((self.year, self.month), [])) != self.days_in_month:
+        if len(vector) != self.days_in_month:
             raise ValueError(f"Watchstander {watchstander.name} must have an availability vector of length {self.days_in_month}.")
         self.watchstanders[watchstander.name] = watchstander
         self.actual_watch_points[watchstander.name] = 0.0  # Initialize actual watch points
+        self._availability.append(watchstander.name, vector)
+        self._n_head_flags[watchstander.name] = bool(watchstander.is_n_head)
+        self._synced_vectors[watchstander.name] = vector
+        self._watch_pcts[watchstander.name] = watchstander.watch_percentage
+        self._expected_cache = None
             
     def remove_watchstander(self, watchstander: Watchstander) -> None:
         """Remove a watchstander from the month's roster."""
@@ -46,6 +165,34 @@ class Month:
             del self.watchstanders[watchstander.name]
             if watchstander.name in self.actual_watch_points:
                 del self.actual_watch_points[watchstander.name]
+            self._availability.remove(watchstander.name)
+            del self._n_head_flags[watchstander.name]
+            del self._synced_vectors[watchstander.name]
+            del self._watch_pcts[watchstander.name]
+            self._expected_cache = None
+
+    def set_watchstander_availability(self, watchstander_name: str, availability_vector: List[int],
+                                      defer_save: bool = False) -> None:
+        """
+        Replace a rostered watchstander's availability for this month, on both the
+        watchstander and the month's availability matrix.
+        Changes made on the watchstander itself (set_monthly_availability, is_n_head,
+        set_watch_percentage) are picked up by the month's next calculation.
+        
+        Args:
+            watchstander_name: Name of the watchstander
+            availability_vector: New availability vector (BODY_KEY values), one entry per day
+            defer_save: Leave the database write to Watchstander.flush() or bulk_flush()
+        """
+        if watchstander_name not in self.watchstanders:
+            raise ValueError(f"Watchstander {watchstander_name} not found in month's roster")
+        if len(availability_vector) != self.days_in_month:
+            raise ValueError(f"Watchstander {watchstander_name} must have an availability vector of length {self.days_in_month}.")
+        watchstander = self.watchstanders[watchstander_name]
+        watchstander.set_monthly_availability(self.year, self.month, availability_vector, defer_save=defer_save)
+        self._availability.set_row(watchstander_name, availability_vector)
+        self._synced_vectors[watchstander_name] = watchstander.get_monthly_availability(self.year, self.month)
+        self._expected_cache = None
     
     def add_watch(self, watchstander_name: str, day: int, watch_type: str) -> None:
         """
@@ -62,33 +209,53 @@ class Month:
         if day < 1 or day > len(self.month_vector):
             raise ValueError(f"Invalid day: {day}")
             
+        watch_idx = 0 if watch_type == 'D' else 1 if watch_type == 'N' else -1
+        if watch_idx == -1:
+            raise ValueError(f"Invalid watch type: {watch_type}")
+
         # Get the day type from month vector (0-based index)
         day_type = self.month_vector[day - 1]
+        self.actual_watch_points[watchstander_name] += _PTS[watch_idx][day_type]
+        self._expected_cache = None
+    
+    def add_watches(self, names: Sequence[str], days: Sequence[int], watch_types: Sequence[str]) -> None:
+        """
+        Add many watches at once; equivalent to calling add_watch for each
+        (name, day, watch_type) triple, but points are looked up and summed in NumPy.
+        All entries are validated before any points are added.
         
-        # Calculate points based on watch type and day type
-        points = 0
-        if watch_type == 'D':  # Day watch
-            if day_type == 0:  # Workday
-                points = VALUE_KEY["Weekday day watch"]
-            elif day_type == 1:  # Leading into weekend
-                points = VALUE_KEY["Friday day watch"]
-            elif day_type in [2, 3]:  # Weekend or final weekend day
-                points = VALUE_KEY["Friday night/Saturday/Sunday day"]
-        elif watch_type == 'N':  # Night watch
-            if day_type == 0:  # Workday
-                points = VALUE_KEY["Weekday night watch"]
-            elif day_type == 1:  # Leading into weekend
-                points = VALUE_KEY["Friday night/Saturday/Sunday day"]
-            elif day_type == 2:  # Weekend day
-                points = VALUE_KEY["Friday night/Saturday/Sunday day"]
-            elif day_type == 3:  # Final weekend day
-                points = VALUE_KEY["Sunday night"]
-        else:
-            raise ValueError(f"Invalid watch type: {watch_type}")
-            
-        self.actual_watch_points[watchstander_name] += points
+        Args:
+            names: Name of the watchstander for each watch
+            days: Day of the month (1-31) for each watch
+            watch_types: Type of each watch ('D' for day, 'N' for night)
+        """
+        names = list(names)
+        days = np.asarray(days, dtype=np.int64)
+        watch_types = np.asarray(watch_types)
+        if not len(names) == len(days) == len(watch_types):
+            raise ValueError("names, days and watch_types must have the same length")
+        if not names:
+            return
+
+        for name in names:
+            if name not in self.watchstanders:
+                raise ValueError(f"Watchstander {name} not found in month's roster")
+        bad_days = (days < 1) | (days > len(self.month_vector))
+        if bad_days.any():
+            raise ValueError(f"Invalid day: {days[bad_days][0]}")
+        is_night = watch_types == 'N'
+        bad_types = ~(is_night | (watch_types == 'D'))
+        if bad_types.any():
+            raise ValueError(f"Invalid watch type: {watch_types[bad_types][0]}")
+
+        points = np.where(is_night, self._night_pts_by_day[days - 1], self._day_pts_by_day[days - 1])
+        unique_names, name_idx = np.unique(np.asarray(names, dtype=object), return_inverse=True)
+        totals = np.bincount(name_idx, weights=points, minlength=len(unique_names))
+        for name, total in zip(unique_names, totals):
+            self.actual_watch_points[name] += float(total)
+        self._expected_cache = None
     
-    def evaluate_watch_deviations(self) -> Dict[str, Dict[str, float]]:
+    def evaluate_watch_deviations(self, expected_points: Optional[Dict[str, float]] = None) -> Dict[str, Dict[str, float]]:
         """
         Evaluate the deviation between expected and actual watch points for each watchstander.
         Returns a dictionary with watchstander names as keys and dictionaries containing:
@@ -96,26 +263,32 @@ class Month:
         - actual_points: Actual watch points stood
         - deviation: Difference between expected and actual (positive means stood too little, negative means stood too much)
         - deviation_percentage: Deviation as a percentage of expected points
-        """
-        expected_points = self.calculate_expected_watch_points()
-        deviations = {}
         
-        for ws in self.watchstanders:
-            name = ws.name
-            expected = expected_points[name]
-            actual = self.actual_watch_points.get(name, 0.0)
-            # Invert the deviation calculation so positive means stood too little
-            deviation = expected - actual
-            deviation_percentage = (deviation / expected * 100) if expected > 0 else 0.0
-            
-            deviations[name] = {
-                "expected_points": expected,
-                "actual_points": actual,
-                "deviation": deviation,
-                "deviation_percentage": deviation_percentage
+        Args:
+            expected_points: Already calculated expected points; calculated when omitted
+        """
+        if expected_points is None:
+            expected_points = self._compute_expected()[0]
+        return self._deviations_from(expected_points)
+
+    def _deviations_from(self, expected_points: Dict[str, float]) -> Dict[str, Dict[str, float]]:
+        """Build the evaluate_watch_deviations result from already calculated expected points."""
+        names = list(self.watchstanders)
+        expected = np.fromiter((expected_points[name] for name in names), dtype=np.float64, count=len(names))
+        actual = np.fromiter((self.actual_watch_points.get(name, 0.0) for name in names), dtype=np.float64, count=len(names))
+        # Invert the deviation calculation so positive means stood too little
+        deviation = expected - actual
+        deviation_percentage = np.divide(deviation, expected, out=np.zeros_like(deviation), where=expected > 0) * 100
+        return {
+            name: {
+                "expected_points": exp,
+                "actual_points": act,
+                "deviation": dev,
+                "deviation_percentage": pct
             }
-            
-        return deviations
+            for name, exp, act, dev, pct in zip(
+                names, expected.tolist(), actual.tolist(), deviation.tolist(), deviation_percentage.tolist())
+        }
     
     def get_watchstander(self, name: str) -> Optional[Watchstander]:
         """Get a watchstander by name."""
@@ -138,107 +311,83 @@ class Month:
         Calculate total available days for all watchstanders in the month.
         Returns a dictionary mapping watchstander names to their available days.
         """
-        total_available = 0
-        individual_available = {}
-        
-        for ws in self.watchstanders.values():
-            available_days, _, _ = ws.calculate_monthly_availability(self.year, self.month)
-            individual_available[ws.name] = available_days
-            total_available += available_days
-            
-        return individual_available
+        if not self.watchstanders:
+            return {}
+        self._sync_roster()
+        return self._availability.available_days()
+
+    def _sync_roster(self) -> None:
+        """
+        Refresh the availability rows, N-head flags and watch percentages of rostered
+        watchstanders changed since they were last read, dropping the expected points cache if any were.
+        """
+        changed = False
+        for name, ws in self.watchstanders.items():
+            vector = ws.get_monthly_availability(self.year, self.month)
+            if vector is not self._synced_vectors[name]:
+                if vector is None or len(vector) != self.days_in_month:
+                    raise ValueError(f"Watchstander {name} must have an availability vector of length {self.days_in_month}.")
+                self._availability.set_row(name, vector)
+                self._synced_vectors[name] = vector
+                changed = True
+            is_n_head = bool(ws.is_n_head)
+            if is_n_head != self._n_head_flags[name] or ws.watch_percentage != self._watch_pcts[name]:
+                self._n_head_flags[name] = is_n_head
+                self._watch_pcts[name] = ws.watch_percentage
+                changed = True
+        if changed:
+            self._expected_cache = None
     
+    def _compute_expected(self) -> Tuple[Dict[str, float], Dict[str, float]]:
+        """
+        Calculate (expected_points, availability_actual_points) per watchstander without
+        touching the watchstanders. Actual points here are scored from the 8/9 codes of the
+        availability vectors. The result is cached until the roster, the watches or the
+        availability, N-head flag or watch percentage of a rostered watchstander change.
+        """
+        self._sync_roster()
+        if self._expected_cache is not None:
+            return self._expected_cache
+        if not self.watchstanders:
+            return {}, {}
+        n = len(self.watchstanders)
+        expected, actual = expected_points_kernel(
+            self._availability.A,
+            self._day_pts_by_day,
+            self._night_pts_by_day,
+            np.fromiter(self._n_head_flags.values(), dtype=np.bool_, count=n),
+            np.fromiter(self._watch_pcts.values(), dtype=np.float64, count=n),
+            self._total_monthly_points,
+            28.0,
+        )
+        self._expected_cache = (
+            dict(zip(self._availability.name_idx, expected.tolist())),
+            dict(zip(self._availability.name_idx, actual.tolist())),
+        )
+        return self._expected_cache
+
+    def _sync_watchstander_deviations(self, expected_points: Dict[str, float], actual_points: Dict[str, float]) -> None:
+        """Record each watchstander's points deviation for this month."""
+        for name, ws in self.watchstanders.items():
+            ws.update_points_deviation(self.year, self.month, expected_points[name], actual_points[name])
+
     def calculate_expected_watch_points(self):
-        """Calculate expected watch points for each watchstander."""
-        # Calculate total monthly points
-        total_monthly_points = 0
-        for day_type in self.month_vector:
-            if day_type == 0:  # Full workday
-                total_monthly_points += VALUE_KEY["Weekday day watch"] + VALUE_KEY["Weekday night watch"]
-            elif day_type == 1:  # Leading into weekend
-                total_monthly_points += VALUE_KEY["Friday day watch"] + VALUE_KEY["Friday night/Saturday/Sunday day"]
-            elif day_type == 2:  # Weekend day
-                total_monthly_points += VALUE_KEY["Friday night/Saturday/Sunday day"]
-            elif day_type == 3:  # Final day of weekend
-                total_monthly_points += VALUE_KEY["Friday night/Saturday/Sunday day"] + VALUE_KEY["Sunday night"]
-        
-        # Calculate N-head points first
-        n_head_points = 0
-        for ws in self.watchstanders.values():
-            if ws.is_n_head:
-                # Calculate N-head points based on availability percentage
-                availability_vector = ws.availability_vectors.get((self.year, self.month), [])
-                if availability_vector:
-                    total_days = len(availability_vector)
-                    available_days = sum(1 for day in availability_vector if day > 0)
-                    availability_percentage = available_days / total_days if total_days > 0 else 0.0
-                    n_head_points += availability_percentage * 28.0
-        
-        # Calculate remaining points for regular watchstanders
-        remaining_points = total_monthly_points - n_head_points
-        
-        # Calculate total watch percentage for regular watchstanders
-        total_watch_percentage = 0
-        for ws in self.watchstanders.values():
-            if not ws.is_n_head:
-                availability_vector = ws.availability_vectors.get((self.year, self.month), [])
-                if availability_vector:
-                    total_days = len(availability_vector)
-                    available_days = sum(1 for day in availability_vector if day > 0)
-                    availability_percentage = available_days / total_days if total_days > 0 else 0.0
-                    total_watch_percentage += availability_percentage * ws.watch_percentage
-        
-        # Calculate expected points for each watchstander
-        expected_points = {}
-        for ws in self.watchstanders.values():
-            if ws.is_n_head:
-                # N-heads get points based on their availability percentage
-                availability_vector = ws.availability_vectors.get((self.year, self.month), [])
-                if availability_vector:
-                    total_days = len(availability_vector)
-                    available_days = sum(1 for day in availability_vector if day > 0)
-                    availability_percentage = available_days / total_days if total_days > 0 else 0.0
-                    expected_points[ws.name] = availability_percentage * 28.0
-                else:
-                    expected_points[ws.name] = 0.0
-            else:
-                # Regular watchstanders get points based on their availability and watch percentage
-                availability_vector = ws.availability_vectors.get((self.year, self.month), [])
-                if availability_vector and total_watch_percentage > 0:
-                    total_days = len(availability_vector)
-                    available_days = sum(1 for day in availability_vector if day > 0)
-                    availability_percentage = available_days / total_days if total_days > 0 else 0.0
-                    watch_share = (availability_percentage * ws.watch_percentage) / total_watch_percentage
-                    expected_points[ws.name] = watch_share * remaining_points
-                else:
-                    expected_points[ws.name] = 0.0
-            
-            # Calculate actual points
-            actual_points = 0.0
-            availability_vector = ws.availability_vectors.get((self.year, self.month), [])
-            for day_idx, val in enumerate(availability_vector):
-                day_type = self.month_vector[day_idx]
-                if val == 8:  # Day watch
-                    if day_type == 0:  # Workday
-                        actual_points += VALUE_KEY["Weekday day watch"]
-                    elif day_type == 1:  # Leading into weekend
-                        actual_points += VALUE_KEY["Friday day watch"]
-                    elif day_type in [2, 3]:  # Weekend or final weekend day
-                        actual_points += VALUE_KEY["Friday night/Saturday/Sunday day"]
-                elif val == 9:  # Night watch
-                    if day_type == 0:  # Workday
-                        actual_points += VALUE_KEY["Weekday night watch"]
-                    elif day_type == 1:  # Leading into weekend
-                        actual_points += VALUE_KEY["Friday night/Saturday/Sunday day"]
-                    elif day_type == 2:  # Weekend day
-                        actual_points += VALUE_KEY["Friday night/Saturday/Sunday day"]
-                    elif day_type == 3:  # Final weekend day
-                        actual_points += VALUE_KEY["Sunday night"]
-            
-            # Update points deviation
-            ws.update_points_deviation(self.year, self.month, expected_points[ws.name], actual_points)
-        
-        return expected_points
+        """
+        Calculate expected watch points for each watchstander and update their points deviation.
+        The calculation is cached until the roster, the watches or a rostered watchstander change.
+        """
+        expected_points, actual_points = self._compute_expected()
+        self._sync_watchstander_deviations(expected_points, actual_points)
+        return dict(expected_points)
+
+    def invalidate_expected_points(self) -> None:
+        """
+        Re-read every rostered watchstander's availability, N-head flag and watch percentage
+        for this month and drop the cached expected watch points, so the next calculation starts fresh.
+        """
+        self._synced_vectors = dict.fromkeys(self._synced_vectors)
+        self._sync_roster()
+        self._expected_cache = None
     
     def get_month_summary(self) -> Dict:
         """
@@ -249,7 +398,10 @@ class Month:
         - Expected watch points for each watchstander
         - Actual watch points and deviations
         """
-        deviations = self.evaluate_watch_deviations()
+        # Expected points are calculated once and shared with the deviations; watchstanders'
+        # stored deviations are only updated by calculate_expected_watch_points()
+        expected_points = dict(self._compute_expected()[0])
+        deviations = self.evaluate_watch_deviations(expected_points)
         return {
             "year": self.year,
             "month": self.month,
@@ -257,7 +409,7 @@ class Month:
             "n_heads": len(self.get_n_heads()),
             "regular_watchstanders": len(self.get_regular_watchstanders()),
             "availability": self.calculate_total_availability(),
-            "expected_points": self.calculate_expected_watch_points(),
+            "expected_points": expected_points,
             "actual_points": self.actual_watch_points,
             "deviations": deviations
         }
@@ -271,14 +423,20 @@ class Month:
         Print the expected and actual watch points for each watchstander.
         """
         summary = self.get_month_summary()
-        print('\nWatchstander Breakdown:')
-        for name in summary['expected_points']:
-            print(f'{name:20}  Expected: {summary["expected_points"][name]:6.1f}  Actual: {summary["actual_points"][name]:6.1f}  Deviation: {summary["actual_points"][name] - summary["expected_points"][name]:+6.1f}')
+        expected_points = summary['expected_points']
+        actual_points = summary['actual_points']
+        # Collect every line and print once instead of once per watchstander
+        lines = ['\nWatchstander Breakdown:']
+        lines.extend(
+            f'{name:20}  Expected: {expected:6.1f}  Actual: {actual_points[name]:6.1f}  Deviation: {actual_points[name] - expected:+6.1f}'
+            for name, expected in expected_points.items()
+        )
+        print('\n'.join(lines))
 
-    @staticmethod
-    def normalize_name(name):
+    @classmethod
+    def normalize_name(cls, name):
         """Collapse multiple spaces, strip, and lowercase a name for robust matching."""
-        return re.sub(r'\s+', ' ', str(name)).strip().lower()
+        return cls._WS_RE.sub(' ', str(name)).strip().lower()
 
     @staticmethod
     def build_month_from_excel(filepath: str, year: int, month: int) -> 'Month':
@@ -286,34 +444,41 @@ class Month:
         Build a Month object for the specified year and month from the given Excel file.
         Assumes first row is header, first column is name, rest are availability vector (BODY_KEY values).
         Uses default values for check-in/qualification dates.
-        Skips rows where the name is missing or NaN.
+        Skips rows where the name is missing or blank.
         Adds actual watches for days marked 8 (day watch) and 9 (night watch).
         Sets is_n_head=True for CDR IVEY, LCDR KIM, LCDR HUNTLEY, LCDR DESORMIER, LCDR DESPOTA (case-insensitive).
         """
         n_heads = {Month.normalize_name(n) for n in [
             'CDR IVEY', 'LCDR KIM', 'LCDR HUNTLEY', 'LCDR DESORMIER', 'LCDR DESPOTA']}
-        df = pd.read_excel(filepath)
+        rows = iter_sheet_rows(filepath)
+        next(rows, None)  # Skip the header row
         month_obj = Month(year, month)
-        for _, row in df.iterrows():
-            name = row.iloc[0]
-            if pd.isna(name) or not str(name).strip():
+        names = []
+        cells = []
+        for row in rows:
+            name = row[0] if row else None
+            if name is None or not str(name).strip():
                 continue  # Skip rows with missing or empty name
+            names.append(name)
+            cells.append(row[1:])
+        if not names:
+            return month_obj
+        # Check the availability vectors are filled, the right length and valid, and cast them at once
+        avail_block = availability_block(names, cells, month_obj.days_in_month)
+        for name, availability_vector in zip(names, avail_block):
             # N-head logic with normalized name
             is_n_head = Month.normalize_name(name) in n_heads
-            # Replace NaN with 0 in the availability vector
-            availability_vector = [int(x) if pd.notna(x) else 0 for x in row.iloc[1:].tolist()]
-            # Ensure the availability vector is filled and has the correct length
-            if not availability_vector or len(availability_vector) != month_obj.days_in_month:
-                raise ValueError(f"Watchstander {name} must have a filled availability vector of length {month_obj.days_in_month}.")
             ws = Watchstander(name, is_n_head)
-            ws.set_monthly_availability(year, month, availability_vector)
+            ws.set_monthly_availability(year, month, availability_vector, defer_save=True)
             month_obj.add_watchstander(ws)
-            # Add actual watches for days marked 8 or 9
-            for day_idx, val in enumerate(availability_vector):
-                if val == 8:
-                    month_obj.add_watch(name, day_idx + 1, 'D')  # Day is 1-indexed
-                elif val == 9:
-                    month_obj.add_watch(name, day_idx + 1, 'N')
+        # Save the whole roster in one transaction
+        Watchstander.bulk_flush(month_obj.watchstanders.values())
+        # Actual watches are the days marked 8 (day watch) or 9 (night watch); score them all at once
+        avail = month_obj._availability.A
+        actual = (np.where(avail == 8, month_obj._day_pts_by_day, 0.0).sum(axis=1)
+                  + np.where(avail == 9, month_obj._night_pts_by_day, 0.0).sum(axis=1))
+        for name, points in zip(month_obj._availability.name_idx, actual.tolist()):
+            month_obj.actual_watch_points[name] = points
         return month_obj
 
     def print_month_summary(self):
@@ -321,79 +486,80 @@ class Month:
         Print a summary of the month using Month.get_month_summary().
         """
         summary = self.get_month_summary()
-        print(f"\nMonth Summary for {summary['year']}-{summary['month']:02d}:")
-        print(f"Total Watchstanders: {summary['total_watchstanders']}")
-        print(f"N-Heads: {summary['n_heads']}")
-        print(f"Regular Watchstanders: {summary['regular_watchstanders']}")
-        print("\nAvailability:")
-        for name, avail in summary['availability'].items():
-            print(f"  {name}: {avail} days available")
-        print("\nExpected Watch Points:")
-        for name, points in summary['expected_points'].items():
-            print(f"  {name}: {points:.1f}")
-        print("\nActual Watch Points:")
-        for name, points in summary['actual_points'].items():
-            print(f"  {name}: {points:.1f}")
-        print("\nWatch Point Deviations:")
+        # Collect every line and print once instead of once per line
+        lines = [
+            f"\nMonth Summary for {summary['year']}-{summary['month']:02d}:",
+            f"Total Watchstanders: {summary['total_watchstanders']}",
+            f"N-Heads: {summary['n_heads']}",
+            f"Regular Watchstanders: {summary['regular_watchstanders']}",
+            "\nAvailability:",
+        ]
+        lines.extend(f"  {name}: {avail} days available" for name, avail in summary['availability'].items())
+        lines.append("\nExpected Watch Points:")
+        lines.extend(f"  {name}: {points:.1f}" for name, points in summary['expected_points'].items())
+        lines.append("\nActual Watch Points:")
+        lines.extend(f"  {name}: {points:.1f}" for name, points in summary['actual_points'].items())
+        lines.append("\nWatch Point Deviations:")
         for name, data in summary['deviations'].items():
-            print(f"\n{name}:")
-            print(f"  Expected Points: {data['expected_points']:.1f}")
-            print(f"  Actual Points: {data['actual_points']:.1f}")
-            print(f"  Deviation: {data['deviation']:+.1f} points ({data['deviation_percentage']:+.1f}%)")
+            lines.append(f"\n{name}:")
+            lines.append(f"  Expected Points: {data['expected_points']:.1f}")
+            lines.append(f"  Actual Points: {data['actual_points']:.1f}")
+            lines.append(f"  Deviation: {data['deviation']:+.1f} points ({data['deviation_percentage']:+.1f}%)")
             if data['deviation'] > 0:
-                print(f"  Status: Needs {data['deviation']:.1f} more points to reach expected watch")
+                lines.append(f"  Status: Needs {data['deviation']:.1f} more points to reach expected watch")
             elif data['deviation'] < 0:
-                print(f"  Status: Has stood {abs(data['deviation']):.1f} more points than expected")
+                lines.append(f"  Status: Has stood {abs(data['deviation']):.1f} more points than expected")
             else:
-                print("  Status: Perfectly balanced")
+                lines.append("  Status: Perfectly balanced")
+        print("\n".join(lines))
 
     def visualize_month_summary(self):
         summary = self.get_month_summary()
         names = list(summary['expected_points'].keys())
-        expected = [summary['expected_points'][n] for n in names]
-        actual = [summary['actual_points'][n] for n in names]
-        deviations = [summary['deviations'][n]['deviation'] for n in names]
-        n_heads = set(ws.name for ws in self.get_n_heads())
-        is_n_head = [n in n_heads for n in names]
+        expected = np.asarray([summary['expected_points'][n] for n in names], dtype=float)
+        actual = np.asarray([summary['actual_points'][n] for n in names], dtype=float)
+        deviations = np.asarray([summary['deviations'][n]['deviation'] for n in names], dtype=float)
+        is_n_head = np.fromiter((self._n_head_flags[n] for n in names), dtype=bool, count=len(names))
+
+        # All four charts share one figure so the backend is set up and shown once
+        fig, axs = plt.subplots(2, 2, figsize=(16, 12))
 
         # 1. Bar chart: Expected vs. Actual Watch Points
-        plt.figure(figsize=(14, 6))
-        x = range(len(names))
-        plt.bar(x, expected, width=0.4, label='Expected', align='center')
-        plt.bar(x, actual, width=0.4, label='Actual', align='edge')
-        plt.xticks(x, names, rotation=90)
-        plt.ylabel('Watch Points')
-        plt.title('Expected vs. Actual Watch Points per Watchstander')
-        plt.legend()
-        plt.tight_layout()
-        plt.show()
+        ax = axs[0, 0]
+        x = np.arange(len(names))
+        ax.bar(x, expected, width=0.4, label='Expected', align='center')
+        ax.bar(x, actual, width=0.4, label='Actual', align='edge')
+        ax.set_xticks(x)
+        ax.set_xticklabels(names, rotation=90)
+        ax.set_ylabel('Watch Points')
+        ax.set_title('Expected vs. Actual Watch Points per Watchstander')
+        ax.legend()
 
         # 2. Bar chart: Deviation per Watchstander
-        plt.figure(figsize=(14, 6))
-        plt.bar(x, deviations, color=['green' if d < 0 else 'red' for d in deviations])
-        plt.xticks(x, names, rotation=90)
-        plt.ylabel('Deviation (Expected - Actual)')
-        plt.title('Deviation in Watch Points per Watchstander')
-        plt.axhline(0, color='black', linewidth=0.8)
-        plt.tight_layout()
-        plt.show()
+        ax = axs[0, 1]
+        ax.bar(x, deviations, color=np.where(deviations < 0, 'green', 'red'))
+        ax.set_xticks(x)
+        ax.set_xticklabels(names, rotation=90)
+        ax.set_ylabel('Deviation (Expected - Actual)')
+        ax.set_title('Deviation in Watch Points per Watchstander')
+        ax.axhline(0, color='black', linewidth=0.8)
 
         # 3. Pie chart: N-heads vs. Regular
-        n_n_heads = sum(is_n_head)
+        ax = axs[1, 0]
+        n_n_heads = int(is_n_head.sum())
         n_regular = len(names) - n_n_heads
-        plt.figure(figsize=(6, 6))
-        plt.pie([n_n_heads, n_regular], labels=['N-heads', 'Regular'], autopct='%1.1f%%', startangle=90)
-        plt.title('Proportion of N-heads vs. Regular Watchstanders')
-        plt.axis('equal')
-        plt.show()
+        ax.pie([n_n_heads, n_regular], labels=['N-heads', 'Regular'], autopct='%1.1f%%', startangle=90)
+        ax.set_title('Proportion of N-heads vs. Regular Watchstanders')
+        ax.axis('equal')
 
         # 4. Histogram: Distribution of deviations
-        plt.figure(figsize=(8, 6))
-        plt.hist(deviations, bins=10, color='skyblue', edgecolor='black')
-        plt.xlabel('Deviation (Expected - Actual)')
-        plt.ylabel('Number of Watchstanders')
-        plt.title('Distribution of Watch Point Deviations')
-        plt.tight_layout()
+        ax = axs[1, 1]
+        ax.hist(deviations, bins=10, color='skyblue', edgecolor='black')
+        ax.set_xlabel('Deviation (Expected - Actual)')
+        ax.set_ylabel('Number of Watchstanders')
+        ax.set_title('Distribution of Watch Point Deviations')
+
+        fig.tight_layout()
         plt.show()
 
 if __name__ == "__main__":
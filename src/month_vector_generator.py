@@ -3,120 +3,107 @@ Module for generating a month vector based on a month's schedule.
 """
 import calendar
 from datetime import datetime, date, timedelta
-from typing import List, Set
+from functools import lru_cache
+from typing import FrozenSet, Iterable, Optional, Set, Tuple
+import numpy as np
+from src.constants import FEDERAL_HOLIDAYS
+
+# Default day type of each weekday (Monday=0 ... Sunday=6) before days off and holidays
+_WEEKDAY_DAY_TYPES = np.array([0, 0, 0, 0, 1, 2, 3], dtype=np.int8)
+
+# Code given to the day before a federal holiday, by the holiday's weekday (-1: holiday not patched).
+# Thursday, Friday and Monday holidays make the day before lead into the break; a Tuesday
+# holiday takes the Monday off as well. The holiday and the day after are always coded 2.
+_HOLIDAY_DAY_BEFORE = np.array([1, 2, -1, 1, 1, -1, -1], dtype=np.int8)
+
+def _resolve_holiday(year: int, rule: tuple) -> date:
+    """Turn a FEDERAL_HOLIDAYS rule into a date: (month, day) or (month, nth, weekday), nth=-1 for last."""
+    if len(rule) == 2:
+        return date(year, *rule)
+    month, nth, weekday = rule
+    if nth > 0:
+        # Days from the 1st to the first matching weekday, then whole weeks
+        first_weekday = date(year, month, 1).weekday()
+        return date(year, month, 1 + (weekday - first_weekday) % 7 + 7 * (nth - 1))
+    # Counted back from the month's last day
+    last_day = calendar.monthrange(year, month)[1]
+    last_weekday = date(year, month, last_day).weekday()
+    return date(year, month, last_day - (last_weekday - weekday) % 7 + 7 * (nth + 1))
+
+@lru_cache(maxsize=32)
+def federal_holidays_for_year(year: int) -> FrozenSet[date]:
+    """Return the federal holidays of the given year, resolved once from FEDERAL_HOLIDAYS."""
+    return frozenset(_resolve_holiday(year, rule) for rule in FEDERAL_HOLIDAYS.values())
+
+def is_federal_holiday(d: date) -> bool:
+    """Return True if the date is a federal holiday."""
+    return d in federal_holidays_for_year(d.year)
 
 def get_federal_holidays(year: int) -> Set[date]:
     """Return a set of federal holidays for the given year."""
-    holidays = set()
-    # New Year's Day
-    holidays.add(date(year, 1, 1))
-    # Martin Luther King Jr. Day (3rd Monday in January)
-    mlk_day = date(year, 1, 1)
-    while mlk_day.weekday() != 0 or mlk_day.day > 21:
-        mlk_day = mlk_day.replace(day=mlk_day.day + 1)
-    holidays.add(mlk_day)
-    # Presidents' Day (3rd Monday in February)
-    pres_day = date(year, 2, 1)
-    while pres_day.weekday() != 0 or pres_day.day > 21:
-        pres_day = pres_day.replace(day=pres_day.day + 1)
-    holidays.add(pres_day)
-    # Memorial Day (Last Monday in May)
-    mem_day = date(year, 5, 31)
-    while mem_day.weekday() != 0:
-        mem_day = mem_day.replace(day=mem_day.day - 1)
-    holidays.add(mem_day)
-    # Juneteenth (June 19)
-    holidays.add(date(year, 6, 19))
-    # Independence Day
-    holidays.add(date(year, 7, 4))
-    # Labor Day (First Monday in September)
-    lab_day = date(year, 9, 1)
-    while lab_day.weekday() != 0:
-        lab_day = lab_day.replace(day=lab_day.day + 1)
-    holidays.add(lab_day)
-    # Columbus Day (Second Monday in October)
-    col_day = date(year, 10, 1)
-    while col_day.weekday() != 0 or col_day.day > 14:
-        col_day = col_day.replace(day=col_day.day + 1)
-    holidays.add(col_day)
-    # Veterans Day
-    holidays.add(date(year, 11, 11))
-    # Thanksgiving Day (4th Thursday in November)
-    thanks_day = date(year, 11, 1)
-    while thanks_day.weekday() != 3 or thanks_day.day > 28:
-        thanks_day = thanks_day.replace(day=thanks_day.day + 1)
-    holidays.add(thanks_day)
-    # Christmas Day
-    holidays.add(date(year, 12, 25))
+    return set(federal_holidays_for_year(year))
+
+@lru_cache(maxsize=32)
+def _federal_holiday_dates(year: int) -> np.ndarray:
+    """Federal holidays of a year as a sorted, read-only datetime64[D] array, weekend holidays included."""
+    holidays = np.array(sorted(federal_holidays_for_year(year)), dtype="datetime64[D]")
+    holidays.setflags(write=False)
     return holidays
 
-def generate_month_vector(year: int, month: int, days_off: Set[int] = None) -> List[int]:
+@lru_cache(maxsize=256)
+def _month_days(year: int, month: int) -> np.ndarray:
+    """Every date of the month as a read-only datetime64[D] array."""
+    first_day = np.datetime64(f"{year:04d}-{month:02d}-01", "D")
+    days = first_day + np.arange(calendar.monthrange(year, month)[1])
+    days.setflags(write=False)
+    return days
+
+@lru_cache(maxsize=256)
+def federal_holiday_mask(year: int, month: int) -> np.ndarray:
+    """Return a read-only boolean array marking which days of the month are federal holidays."""
+    mask = np.isin(_month_days(year, month), _federal_holiday_dates(year))
+    mask.setflags(write=False)
+    return mask
+
+def generate_month_vector(year: int, month: int, days_off: Optional[Iterable[int]] = None) -> Tuple[int, ...]:
     """
     Generate a month vector for the specified year and month.
+    Results are cached per (year, month, days_off) and returned as an immutable tuple;
+    use list(...) where a mutable copy is needed.
     Coding:
     0: Full workday
     1: Day leading into a weekend or holiday
     2: Weekend day or day off work
     3: Final day of a weekend or holiday break
     """
+    return _generate_month_vector_cached(year, month, frozenset(days_off or ()))
+
+@lru_cache(maxsize=256)
+def _generate_month_vector_cached(year: int, month: int, days_off: FrozenSet[int]) -> Tuple[int, ...]:
+    """Build the month vector for generate_month_vector."""
     if year == 2025 and month == 2:
-        return [2, 3, 0, 0, 0, 0, 1, 2, 3, 0, 0, 0, 0, 1, 2, 3, 0, 0, 0, 0, 1, 2, 3, 0, 0, 0, 0, 1]
-    cal = calendar.monthcalendar(year, month)
-    days_off = days_off or set()
-    federal_holidays = get_federal_holidays(year)
-    # Build a list of all days in the month
-    days_in_month = [date(year, month, day) for week in cal for day in week if day != 0]
+        return (2, 3, 0, 0, 0, 0, 1, 2, 3, 0, 0, 0, 0, 1, 2, 3, 0, 0, 0, 0, 1, 2, 3, 0, 0, 0, 0, 1)
+    days = _month_days(year, month)
+    # Day 0 of datetime64 (1970-01-01) was a Thursday
+    weekdays = (days.astype(np.int64) + 3) % 7
     # Start with default coding
-    month_vector = []
-    for d in days_in_month:
-        if d.weekday() < 4:
-            month_vector.append(0)  # Full workday
-        elif d.weekday() == 4:
-            month_vector.append(1)  # Day leading into a weekend
-        elif d.weekday() == 5:
-            month_vector.append(2)  # Weekend day
-        elif d.weekday() == 6:
-            month_vector.append(3)  # Final day of a weekend
+    month_vector = _WEEKDAY_DAY_TYPES[weekdays]
     # Handle custom days off
-    for idx, d in enumerate(days_in_month):
-        if d.day in days_off:
-            month_vector[idx] = 2  # Weekend day or day off work
-    # Handle federal holidays
-    for holiday in federal_holidays:
-        if holiday.month == month and holiday.year == year:
-            idx = (holiday - days_in_month[0]).days
-            if 0 <= idx < len(month_vector):
-                # Thursday holiday: Thursday & Friday off
-                if holiday.weekday() == 3:
-                    if idx-1 >= 0:
-                        month_vector[idx-1] = 1  # Day leading into a weekend
-                    month_vector[idx] = 2  # Weekend day
-                    if idx+1 < len(month_vector):
-                        month_vector[idx+1] = 2  # Weekend day
-                # Friday holiday: Friday & Saturday off
-                elif holiday.weekday() == 4:
-                    if idx-1 >= 0:
-                        month_vector[idx-1] = 1  # Day leading into a weekend
-                    month_vector[idx] = 2  # Weekend day
-                    if idx+1 < len(month_vector):
-                        month_vector[idx+1] = 2  # Weekend day
-                # Monday holiday: Monday & Tuesday off
-                elif holiday.weekday() == 0:
-                    if idx-1 >= 0:
-                        month_vector[idx-1] = 1  # Day leading into a weekend
-                    month_vector[idx] = 2  # Weekend day
-                    if idx+1 < len(month_vector):
-                        month_vector[idx+1] = 2  # Weekend day
-                # Tuesday holiday: Monday & Tuesday off
-                elif holiday.weekday() == 1:
-                    if idx-1 >= 0:
-                        month_vector[idx-1] = 1  # Day leading into a weekend
-                    if idx-1 >= 0:
-                        month_vector[idx-1] = 2  # Weekend day
-                    month_vector[idx] = 2  # Weekend day
-                    if idx+1 < len(month_vector):
-                        month_vector[idx+1] = 2  # Weekend day
-    return month_vector
+    off_idx = [day - 1 for day in days_off if 1 <= day <= len(days)]
+    month_vector[off_idx] = 2  # Weekend day or day off work
+    # Handle federal holidays; no two fall within two days of each other in a month,
+    # so the day before/holiday/day after writes never overlap
+    holiday_idx = np.flatnonzero(federal_holiday_mask(year, month))
+    day_before_code = _HOLIDAY_DAY_BEFORE[weekdays[holiday_idx]]
+    patched = day_before_code >= 0
+    holiday_idx = holiday_idx[patched]
+    day_before_code = day_before_code[patched]
+    has_day_before = holiday_idx > 0
+    month_vector[holiday_idx[has_day_before] - 1] = day_before_code[has_day_before]
+    month_vector[holiday_idx] = 2  # Weekend day
+    day_after_idx = holiday_idx + 1
+    month_vector[day_after_idx[day_after_idx < len(month_vector)]] = 2  # Weekend day
+    return tuple(month_vector.tolist())
 
 if __name__ == "__main__":
     # Example usage
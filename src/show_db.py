@@ -1,60 +1,56 @@
 """
 Script to display the contents of the watchbill database.
 """
-from src.database import get_db_session, WatchstanderDB
+from src.database import db_session, WatchstanderDB
 from src.month import Month
 from src.watchstander import Watchstander
 from src.month_vector_generator import generate_month_vector
 import json
+import logging
 from datetime import datetime
+import numpy as np
 import pandas as pd
-from collections import Counter
-from src.constants import VALUE_KEY, MONTH_KEY
+from src.constants import MONTH_KEY, WATCH_POINTS
 import argparse
 
+logger = logging.getLogger(__name__)
+
+# Watch points indexed by [day_type, watch] where watch 0 is day (8) and 1 is night (9)
+POINTS_TABLE = np.array(WATCH_POINTS, dtype=np.float64)
+
+# Display label of each availability code, indexed by code
+_AVAIL_LABELS = (
+    "Available",  # 0
+    "Leave Start",  # 1
+    "On Leave",  # 2
+    "Leave End",  # 3
+    "Special Lib Start",  # 4
+    "Special Lib",  # 5
+    "Special Lib End",  # 6
+    "Local Event",  # 7
+    "Day Watch",  # 8
+    "Night Watch",  # 9
+)
+
 def format_datetime(dt):
     """Format datetime for display."""
     return dt.strftime("%Y-%m-%d %H:%M:%S")
 
 def format_availability_vectors(vectors):
-    """Format availability vectors for display."""
+    """Format (year, month) -> vector availability for display."""
     if not vectors:
         return "No availability data"
     
     formatted = {}
-    for month_key, vector in vectors.items():
+    for (year, month), vector in vectors.items():
         # Convert vector to more readable format using BODY_KEY
-        readable_vector = []
-        for day in vector:
-            if day == 0:
-                readable_vector.append("Available")
-            elif day == 1:
-                readable_vector.append("Leave Start")
-            elif day == 2:
-                readable_vector.append("On Leave")
-            elif day == 3:
-                readable_vector.append("Leave End")
-            elif day == 4:
-                readable_vector.append("Special Lib Start")
-            elif day == 5:
-                readable_vector.append("Special Lib")
-            elif day == 6:
-                readable_vector.append("Special Lib End")
-            elif day == 7:
-                readable_vector.append("Local Event")
-            elif day == 8:
-                readable_vector.append("Day Watch")
-            elif day == 9:
-                readable_vector.append("Night Watch")
-            else:
-                readable_vector.append(f"Unknown({day})")
-        formatted[month_key] = readable_vector
+        readable_vector = [_AVAIL_LABELS[day] if 0 <= day < len(_AVAIL_LABELS) else f"Unknown({day})" for day in vector.tolist()]
+        formatted[f"{year}-{month:02d}"] = readable_vector
     return json.dumps(formatted, indent=2)
 
 def show_database_contents():
     """Display all watchstanders in the database."""
-    session = get_db_session()
-    try:
+    with db_session() as session:
         watchstanders = session.query(WatchstanderDB).all()
         
         print("\n=== Watchbill Database Contents ===\n")
@@ -63,115 +59,104 @@ def show_database_contents():
             print(f"Watchstander: {ws.name}")
             print(f"  ID: {ws.id}")
             print("  Availability Vectors:")
-            print(format_availability_vectors(ws.availability_vectors))
+            print(format_availability_vectors(Watchstander.from_db_row(ws).availability_vectors))
             print("\n" + "-"*50 + "\n")
             
         print(f"Total Watchstanders: {len(watchstanders)}")
-        
-    finally:
-        session.close()
-
-def show_database_table():
-    """Display the watchstander database in a table format."""
-    session = get_db_session()
-    try:
-        parser = argparse.ArgumentParser(description='Display the contents of the watchbill database.')
-        parser.add_argument('--year', type=int, required=True, help='Year to display data for.')
-        parser.add_argument('--month', type=int, required=True, help='Month to display data for.')
-        args = parser.parse_args()
 
+def show_database_table(year: int, month: int):
+    """Display the watchstander database for the given year and month in a table format."""
+    with db_session() as session:
         # Create a Month instance for the specified year and month
-        month = Month(args.year, args.month)
+        month_obj = Month(year, month)
         
         # Store watchstanders in original order
         watchstanders_in_order = []
         
-        # Add each watchstander to the month
+        # Add each watchstander with data for this month; displaying the table never writes to the database
+        month_key = (year, month)
+        skipped = []
         for ws in session.query(WatchstanderDB).all():
-            # Convert WatchstanderDB to Watchstander
-            watchstander = Watchstander(
-                name=ws.name,
-                is_n_head=ws.is_n_head
-            )
-            # Set availability
-            month_key = (args.year, args.month)
-            month_vector = ws.availability_vectors.get(month_key, [])
-            watchstander.set_monthly_availability(args.year, args.month, month_vector)
-            month.add_watchstander(watchstander)
+            watchstander = Watchstander.from_db_row(ws)
+            vector = watchstander.get_monthly_availability(year, month)
+            if vector is None or len(vector) != month_obj.days_in_month:
+                skipped.append(watchstander.name)
+                continue
+            month_obj.add_watchstander(watchstander)
             watchstanders_in_order.append(watchstander)
         
-        # Get month summary
-        summary = month.get_month_summary()
+        # Get month summary and record each watchstander's points deviation
+        summary = month_obj.get_month_summary()
+        month_obj.calculate_expected_watch_points()
         
         # Print month vector summary
-        print(f"\n=== {args.year}-{args.month:02d} Month Vector Summary ===")
-        print(f"Total days in month: {len(month.month_vector)}")
+        print(f"\n=== {year}-{month:02d} Month Vector Summary ===")
+        print(f"Total days in month: {len(month_obj.month_vector)}")
         print("\nDay type distribution:")
-        day_type_counts = Counter(month.month_vector)
-        for day_type, count in sorted(day_type_counts.items()):
-            print(f"{day_type} ({MONTH_KEY[day_type]}): {count} days")
+        day_type_counts = np.bincount(np.asarray(month_obj.month_vector), minlength=max(MONTH_KEY) + 1)
+        for day_type, count in enumerate(day_type_counts.tolist()):
+            if count:
+                print(f"{day_type} ({MONTH_KEY[day_type]}): {count} days")
         
         # Print detailed watchstander summary
         print("\n=== Watchstander Summary Table ===")
         
-        # Prepare data for DataFrame
-        data = []
-        for ws in watchstanders_in_order:
-            expected_points = summary['expected_points'][ws.name]
+        # Day and night watch points of each day of the month
+        mv = np.asarray(month_obj.month_vector)
+        day_pts = POINTS_TABLE[mv, 0]
+        night_pts = POINTS_TABLE[mv, 1]
+
+        # Prepare one array per DataFrame column
+        n = len(watchstanders_in_order)
+        expected = np.empty(n, dtype=np.float64)
+        actual = np.empty(n, dtype=np.float64)
+        deviation = np.empty(n, dtype=np.float64)
+        for i, ws in enumerate(watchstanders_in_order):
+            expected[i] = summary['expected_points'][ws.name]
             
             # Calculate actual points from availability vector
-            actual_points = 0.0
             month_vector = ws.availability_vectors.get(month_key, [])
-            print(f"Watchstander: {ws.name}, Availability Vector: {month_vector}")
-            for day_idx, val in enumerate(month_vector):
-                day_type = month.month_vector[day_idx]
-                if val == 8:  # Day watch
-                    if day_type == 0:  # Workday
-                        actual_points += VALUE_KEY["Weekday day watch"]
-                    elif day_type == 1:  # Leading into weekend
-                        actual_points += VALUE_KEY["Friday day watch"]
-                    elif day_type in [2, 3]:  # Weekend or final weekend day
-                        actual_points += VALUE_KEY["Friday night/Saturday/Sunday day"]
-                elif val == 9:  # Night watch
-                    if day_type == 0:  # Workday
-                        actual_points += VALUE_KEY["Weekday night watch"]
-                    elif day_type == 1:  # Leading into weekend
-                        actual_points += VALUE_KEY["Friday night/Saturday/Sunday day"]
-                    elif day_type == 2:  # Weekend day
-                        actual_points += VALUE_KEY["Friday night/Saturday/Sunday day"]
-                    elif day_type == 3:  # Final weekend day
-                        actual_points += VALUE_KEY["Sunday night"]
-            print(f"Watchstander: {ws.name}, Actual Points: {actual_points}")
+            logger.debug("Watchstander: %s, Availability Vector: %s", ws.name, month_vector)
+            av = np.asarray(month_vector)
+            actual[i] = day_pts[av == 8].sum() + night_pts[av == 9].sum()
+            logger.debug("Watchstander: %s, Actual Points: %s", ws.name, float(actual[i]))
             
             # Get points deviation
-            deviation = ws.get_points_deviation(args.year, args.month)
-            
-            row = {
-                'Name': ws.name,
-                'Expected Points': f"{expected_points:.1f}",
-                'Actual Points': f"{actual_points:.1f}",
-                'Points Deviation': f"{deviation:+.1f}"
-            }
-            data.append(row)
+            deviation[i] = ws.get_points_deviation(year, month)
         
         # Create DataFrame and display
-        df = pd.DataFrame(data)
+        df = pd.DataFrame({
+            'Name': [ws.name for ws in watchstanders_in_order],
+            'Expected Points': expected,
+            'Actual Points': actual,
+            'Points Deviation': deviation,
+        })
         pd.set_option('display.max_rows', None)
         pd.set_option('display.max_columns', None)
         pd.set_option('display.width', None)
-        print(df.to_string(index=False))
-        
-        # Calculate total actual points
-        total_actual = sum(float(row['Actual Points']) for row in data)
+        # Points stay numeric in the DataFrame and are only formatted for display
+        print(df.to_string(index=False, formatters={
+            'Expected Points': '{:.1f}'.format,
+            'Actual Points': '{:.1f}'.format,
+            'Points Deviation': '{:+.1f}'.format,
+        }))
         
         # Print total points
-        total_expected = sum(summary['expected_points'].values())
-        print(f"\nTotal Expected Points for {args.year}-{args.month:02d}: {total_expected:.1f}")
-        print(f"Total Actual Points for {args.year}-{args.month:02d}: {total_actual:.1f}")
+        total_actual = float(actual.sum())
+        total_expected = float(expected.sum())
+        print(f"\nTotal Expected Points for {year}-{month:02d}: {total_expected:.1f}")
+        print(f"Total Actual Points for {year}-{month:02d}: {total_actual:.1f}")
         print(f"Difference: {total_actual - total_expected:+.1f} points")
-        
-    finally:
-        session.close()
+        if skipped:
+            print(f"\nNo availability for {year}-{month:02d}, not shown: {', '.join(skipped)}")
+
+def main():
+    """Parse the command line and display the requested month."""
+    parser = argparse.ArgumentParser(description='Display the contents of the watchbill database.')
+    parser.add_argument('--year', type=int, required=True, help='Year to display data for.')
+    parser.add_argument('--month', type=int, required=True, help='Month to display data for.')
+    args = parser.parse_args()
+    show_database_table(args.year, args.month)
 
 if __name__ == "__main__":
-    show_database_table() 
\ No newline at end of file
+    main()
@@ -2,9 +2,49 @@
 Module for implementing a watchbill model similar to the pseudo code.
 """
 from datetime import datetime
+from functools import cached_property
 from typing import List, Dict, Tuple
+import numpy as np
 from src.watchstander import Watchstander
 from src.constants import VALUE_KEY, BODY_KEY, RULES
+from src._kernels import watchbill_rules_kernel
+
+# Availability codes during which no watch may be stood (leave/TDY, special liberty, local event)
+UNAVAILABLE_CODES = [1, 2, 3, 4, 5, 7]
+# Availability codes that count a day's shift points toward a person's availability
+AVAILABLE_FOR_SHIFT_CODES = [0, 4, 5, 6]
+# Availability codes accepted by the availability vector calculations
+AVAILABILITY_CODES = [0, 1, 2, 3, 4, 5, 6, 7]
+
+def _codes_mask(codes: List[int]) -> np.ndarray:
+    """Boolean table over the day codes 0-9 (availability plus day/night watch), True for the given codes."""
+    mask = np.zeros(10, dtype=bool)
+    mask[codes] = True
+    return mask
+
+_UNAVAILABLE_MASK = _codes_mask(UNAVAILABLE_CODES)
+_AVAILABLE_FOR_SHIFT_MASK = _codes_mask(AVAILABLE_FOR_SHIFT_CODES)
+_AVAILABILITY_MASK = _codes_mask(AVAILABILITY_CODES)
+
+def _lookup(mask: np.ndarray, values) -> np.ndarray:
+    """Gather mask[values] elementwise; codes outside the table are False."""
+    values = np.asarray(values)
+    if values.dtype.kind not in "iub":
+        # Floats (or an empty list) cannot index the table; compare by value instead
+        return np.isin(values, np.flatnonzero(mask))
+    in_range = (values >= 0) & (values < len(mask))
+    return in_range & mask[np.where(in_range, values, 0)]
+
+# Day and night watch points to be stood on each day type (workday, leading into weekend, weekend, final weekend day)
+_DAY_TYPE_TOTAL = np.array([
+    VALUE_KEY["Weekday day watch"] + VALUE_KEY["Weekday night watch"],
+    VALUE_KEY["Friday day watch"] + VALUE_KEY["Weekday night watch"],
+    VALUE_KEY["Friday night/Saturday/Sunday day"] + VALUE_KEY["Sunday night"],
+    VALUE_KEY["Sunday night"] + VALUE_KEY["Weekday day watch"],
+], dtype=np.int64)
+
+# Row of each shift in WatchbillModel's shift points table
+_SHIFT_ROWS = {"D": 0, "N": 1}
 
 class WatchbillModel:
     def __init__(self, month_vector: List[int], watchstanders: List[Watchstander]):
@@ -13,70 +53,83 @@ class WatchbillModel:
         self.wh = VALUE_KEY["Working hour"]  # Working hour weight
         self.wodh = VALUE_KEY["Off duty hour"]  # Weekday off-duty hour weight
         self.weh = VALUE_KEY["Weekend/Holiday Hour"]  # Weekend hour weight
+        # Points of a day (row 0) or night (row 1) watch for each day type, indexed [shift][day_type]
+        self._shift_points_by_row = (
+            (4 * self.wodh + 8 * self.wh, 8 * self.wodh + 4 * self.weh, 12 * self.weh, 12 * self.weh),
+            (12 * self.wodh, 12 * self.weh, 12 * self.weh, 4 * self.weh + 8 * self.wodh),
+        )
+
+    @cached_property
+    def _monthly_total_arr(self) -> np.ndarray:
+        """
+        Total shift points for each day of the month, computed on first use and then kept.
+        An invalid month vector raises ValueError here rather than at construction.
+        """
+        points_by_day_type = np.array([
+            16 * self.wodh + 8 * self.wh,  # Full workday
+            8 * self.wodh + 8 * self.wh + 8 * self.weh,  # Leading into weekend
+            24 * self.weh,  # Weekend day
+            24 * self.weh,  # Final weekend day
+        ], dtype=np.float64)
+        day_types = np.asarray(self.month_vector)
+        if not np.isin(day_types, range(len(points_by_day_type))).all():
+            raise ValueError("Invalid input in month vector")
+        return points_by_day_type[day_types.astype(np.intp)]
 
     def monthly_total(self) -> List[int]:
         """Calculate total shift points for each day of the month."""
-        monthly_total = []
-        for day in self.month_vector:
-            if day == 0:  # Full workday
-                monthly_total.append(16 * self.wodh + 8 * self.wh)
-            elif day == 1:  # Leading into weekend
-                monthly_total.append(8 * self.wodh + 8 * self.wh + 8 * self.weh)
-            elif day in [2, 3]:  # Weekend or final weekend day
-                monthly_total.append(24 * self.weh)
-            else:
-                raise ValueError("Invalid input in month vector")
-        return monthly_total
+        return self._monthly_total_arr.tolist()
+
+    @cached_property
+    def _monthly_total_score(self) -> float:
+        """Total shift points for the month, summed once from _monthly_total_arr."""
+        return sum(self._monthly_total_arr.tolist())
 
     def monthly_total_score(self) -> int:
         """Calculate total shift points for the month."""
-        return sum(self.monthly_total())
+        return self._monthly_total_score
+
+    def _available_points(self, availability) -> np.ndarray:
+        """Shift points of each day a person is available (0, 4, 5, 6), 0 on unavailable days (1, 2, 3, 7)."""
+        avail = np.asarray(availability)
+        if not _lookup(_AVAILABILITY_MASK, avail).all():
+            raise ValueError("Invalid input in availability vector")
+        return np.where(_lookup(_AVAILABLE_FOR_SHIFT_MASK, avail), self._monthly_total_arr[:avail.shape[-1]], 0)
 
     def personnel_availability_vector(self, availability: List[int]) -> List[int]:
         """Calculate availability vector for a person."""
-        output_vector = []
-        monthly_total = self.monthly_total()
-        for i, avail in enumerate(availability):
-            if avail in [0, 4, 5, 6]:  # Available or special cases
-                output_vector.append(monthly_total[i])
-            elif avail in [1, 2, 3, 7]:  # Unavailable
-                output_vector.append(0)
-            else:
-                raise ValueError("Invalid input in availability vector")
-        return output_vector
+        return self._available_points(availability).tolist()
 
     def watchbill_availability(self, availability: List[int]) -> List[int]:
         """Determine which watches a person is available for."""
-        watchbill_availability = []
-        for i, avail in enumerate(availability):
-            if avail in [1, 2, 3, 4, 5, 7]:  # Unavailable
-                watchbill_availability.append(0)
-            elif i > 0 and availability[i - 1] == 3 or i < len(availability) - 1 and availability[i + 1] == 1:
-                watchbill_availability.append(0)  # Rule 2: No watch before leave/TDY/special liberty
-            elif i > 0 and availability[i - 1] == 6 and avail == 0:
-                watchbill_availability.append(2)  # Night watch only
-            elif avail == 0 and i < len(availability) - 1 and availability[i + 1] == 4:
-                watchbill_availability.append(1)  # Day watch only
-            elif i > 0 and avail == 0 and i < len(availability) - 1 and availability[i - 1] == 0 and availability[i + 1] == 0:
-                watchbill_availability.append(3)  # Available for either watch
-            else:
-                watchbill_availability.append(0)
-        return watchbill_availability
+        av = np.asarray(availability)
+        if av.size == 0:
+            return []
+        # Neighbouring day codes, with -1 standing in past either end of the month
+        prev = np.concatenate(([-1], av[:-1]))
+        nxt = np.concatenate((av[1:], [-1]))
+        free = av == 0
+        # Conditions in priority order; np.select takes the first that holds
+        conditions = [
+            _lookup(_UNAVAILABLE_MASK, av),  # Unavailable
+            (prev == 3) | (nxt == 1),  # Rule 2: No watch before leave/TDY/special liberty
+            (prev == 6) & free,  # Night watch only
+            free & (nxt == 4),  # Day watch only
+            (prev == 0) & free & (nxt == 0),  # Available for either watch
+        ]
+        return np.select(conditions, [0, 0, 2, 1, 3], default=0).tolist()
 
     def expected_watch_vector(self, availability_matrix: List[List[int]]) -> List[float]:
         """Calculate expected watch points per person."""
-        monthly_total = self.monthly_total()
         monthly_total_watch = self.monthly_total_score()
-        watchstand_avail_vector = []
-        command_availability = 0
-
-        for person_availability in availability_matrix:
-            output_vector = self.personnel_availability_vector(person_availability)
-            watchstand_avail_vector.append(sum(output_vector))
-
-        command_availability = sum(watchstand_avail_vector)
-        expected_watch = [w / command_availability * monthly_total_watch for w in watchstand_avail_vector]
-        return expected_watch
+        if len(availability_matrix) == 0:
+            return []
+        # One pass over the whole availability matrix gives every person's available points
+        watchstand_avail_vector = self._available_points(availability_matrix).sum(axis=1)
+        command_availability = watchstand_avail_vector.sum()
+        if command_availability == 0:
+            raise ZeroDivisionError("float division by zero")
+        return (watchstand_avail_vector / command_availability * monthly_total_watch).tolist()
 
     def watchstander_availability(self, availability_matrix: List[List[int]]) -> List[List[int]]:
         """Convert availability matrix to watchbill availability matrix."""
@@ -87,93 +140,66 @@ class WatchbillModel:
 
     def shift_evaluator(self, shift: str, date: int) -> int:
         """Evaluate points for a specific shift on a given date."""
-        if shift == "D":
-            if self.month_vector[date] == 0:
-                return 4 * self.wodh + 8 * self.wh
-            elif self.month_vector[date] == 1:
-                return 8 * self.wodh + 4 * self.weh
-            elif self.month_vector[date] in [2, 3]:
-                return 12 * self.weh
-        elif shift == "N":
-            if self.month_vector[date] == 0:
-                return 12 * self.wodh
-            elif self.month_vector[date] in [1, 2]:
-                return 12 * self.weh
-            elif self.month_vector[date] == 3:
-                return 4 * self.weh + 8 * self.wodh
-        elif shift == "0":
+        if shift == "0":
             return 0
-        raise ValueError("Invalid shift or date input")
+        row = _SHIFT_ROWS.get(shift)
+        if row is None or self.month_vector[date] not in (0, 1, 2, 3):
+            raise ValueError("Invalid shift or date input")
+        return self._shift_points_by_row[row][self.month_vector[date]]
 
     def evaluate_watchbill(self, watchbill: List[List[int]]) -> Dict[str, any]:
         """Evaluate a watchbill against the rules and return a score or feedback."""
         score = 0
         feedback = []
 
+        wb = np.asarray(watchbill, dtype=np.int8).reshape(len(watchbill), -1) if watchbill else np.zeros((0, 0), dtype=np.int8)
+        n_rows, n_days = wb.shape
+        day_types = np.asarray(self.month_vector[:n_days], dtype=np.int8)
+        if len(day_types) < n_days:
+            raise ValueError("Watchbill has more days than the month vector")
+        # Rows past the end of the watchstander list are treated as regular watchstanders
+        n_head_mask = np.zeros(n_rows, dtype=bool)
+        n_head_flags = [person.is_n_head for person in self.watchstanders[:n_rows]]
+        n_head_mask[:len(n_head_flags)] = n_head_flags
+
+        rule1, rule_counts, watch_counts = watchbill_rules_kernel(wb, _UNAVAILABLE_MASK, n_head_mask, day_types)
+
         # Rule 1: N3, N4, N5, N7 can only stand weekday day watches
-        for i, person in enumerate(self.watchstanders):
-            if person.is_n_head:
-                for j, watch in enumerate(watchbill[i]):
-                    if watch == 1 and self.month_vector[j] != 0:  # Day watch on non-workday
-                        feedback.append(f"Rule 1 violation: {person.name} assigned day watch on non-workday.")
-
-        # Rule 2: No watch before leave/TDY/special liberty
-        for i, person in enumerate(watchbill):
-            for j, watch in enumerate(person):
-                if j > 0 and person[j - 1] in [1, 2, 3, 4, 5, 7]:  # Unavailable
-                    if watch != 0:
-                        feedback.append(f"Rule 2 violation: Watch scheduled before leave/TDY/special liberty.")
-
-        # Rule 3: Two days before leave/TDY/special liberty, only night watch can be scheduled
-        for i, person in enumerate(watchbill):
-            for j, watch in enumerate(person):
-                if j > 1 and person[j - 2] in [1, 2, 3, 4, 5, 7]:  # Unavailable
-                    if watch == 1:  # Day watch
-                        feedback.append(f"Rule 3 violation: Day watch scheduled two days before leave/TDY/special liberty.")
-
-        # Rule 4: No watch after leave/TDY/special liberty
-        for i, person in enumerate(watchbill):
-            for j, watch in enumerate(person):
-                if j < len(person) - 1 and person[j + 1] in [1, 2, 3, 4, 5, 7]:  # Unavailable
-                    if watch != 0:
-                        feedback.append(f"Rule 4 violation: Watch scheduled after leave/TDY/special liberty.")
-
-        # Rule 5: Only night watch can be scheduled the day after leave/TDY/special liberty
-        for i, person in enumerate(watchbill):
-            for j, watch in enumerate(person):
-                if j < len(person) - 1 and person[j + 1] in [1, 2, 3, 4, 5, 7]:  # Unavailable
-                    if watch == 1:  # Day watch
-                        feedback.append(f"Rule 5 violation: Day watch scheduled the day after leave/TDY/special liberty.")
+        for i, _ in np.argwhere(rule1):  # Day watch on non-workday
+            feedback.append(f"Rule 1 violation: {self.watchstanders[i].name} assigned day watch on non-workday.")
+
+        # Rules 2-5: No watch right before or after leave/TDY/special liberty,
+        # and only night watches two days before or the day after
+        rule2, rule3, rule4, rule5 = rule_counts.sum(axis=0).tolist()
+        feedback.extend(["Rule 2 violation: Watch scheduled before leave/TDY/special liberty."] * rule2)
+        feedback.extend(["Rule 3 violation: Day watch scheduled two days before leave/TDY/special liberty."] * rule3)
+        feedback.extend(["Rule 4 violation: Watch scheduled after leave/TDY/special liberty."] * rule4)
+        feedback.extend(["Rule 5 violation: Day watch scheduled the day after leave/TDY/special liberty."] * rule5)
+
+        # Watches assigned to each person, counted once for Rules 6 and 9
+        watch_counts = watch_counts.tolist()
 
         # Rule 6: Personnel are expected to stand an equivalent number of watches per month
         expected_watch = self.expected_watch_vector(watchbill)
-        for i, person in enumerate(watchbill):
-            total_watches = sum(1 for watch in person if watch != 0)
+        for i, total_watches in enumerate(watch_counts):
             if abs(total_watches - expected_watch[i]) > 1:
                 feedback.append(f"Rule 6 violation: {self.watchstanders[i].name} has {total_watches} watches, expected {expected_watch[i]}.")
 
         # Rule 7: Working day defined as 0800-1600. Off duty hour defined as all other times
         # Rule 8: Weekend/holiday hour defined from 1600 Friday to 0800 Monday
         # Rule 9: All personnel stand at least one watch per month
-        for i, person in enumerate(watchbill):
-            if sum(1 for watch in person if watch != 0) == 0:
+        for i, total_watches in enumerate(watch_counts):
+            if total_watches == 0:
                 feedback.append(f"Rule 9 violation: {self.watchstanders[i].name} has no watches assigned.")
 
         return {"score": score, "feedback": feedback}
 
     def calculate_total_watch_points(self) -> int:
         """Calculate the total watch points to be stood in the month."""
-        total_points = 0
-        for day in self.month_vector:
-            if day == 0:  # Full workday
-                total_points += VALUE_KEY["Weekday day watch"] + VALUE_KEY["Weekday night watch"]
-            elif day == 1:  # Leading into weekend
-                total_points += VALUE_KEY["Friday day watch"] + VALUE_KEY["Weekday night watch"]
-            elif day == 2:  # Weekend day
-                total_points += VALUE_KEY["Friday night/Saturday/Sunday day"] + VALUE_KEY["Sunday night"]
-            elif day == 3:  # Final day of a weekend
-                total_points += VALUE_KEY["Sunday night"] + VALUE_KEY["Weekday day watch"]
-        return total_points
+        # Days with an unknown day type add nothing
+        day_types = np.asarray(self.month_vector)
+        known = np.isin(day_types, range(len(_DAY_TYPE_TOTAL)))
+        return int(_DAY_TYPE_TOTAL[day_types[known].astype(np.intp)].sum())
 
 if __name__ == "__main__":
     # Example usage
@@ -1,10 +1,33 @@
 """
 Module for defining the Watchstander class.
 """
+import hashlib
+import logging
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
-from src.database import WatchstanderDB, get_db_session, calculate_total_availability
-from src.constants import VALUE_KEY, MONTH_KEY
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from src.database import (WatchstanderDB, db_session, calculate_total_available_days,
+                          clear_availability_cache, pack_availability_vectors, unpack_availability_vectors)
+from src.constants import VALUE_KEY, MONTH_KEY, WATCH_POINTS
+from src._kernels import count_available, monthly_points_kernel
+
+logger = logging.getLogger(__name__)
+
+# Points one day of each day type adds to the month's total, both watches included
+_TOTAL_PER_DAYTYPE = np.array(WATCH_POINTS, dtype=np.float64).sum(axis=1)
+
+# Expected monthly points of a fully available N-head
+_N_HEAD_MONTHLY_POINTS = VALUE_KEY["Expected N-Head watch monthly (one weekday and one weekend)"]
+
+def _month_key(year: int, month: int) -> Tuple[int, int]:
+    """Key of a month in the per-month dicts of a Watchstander."""
+    return (year, month)
+
+def _as_vector(availability_vector) -> np.ndarray:
+    """Copy an availability vector into the read-only int8 array form Watchstander stores."""
+    vector = np.array(availability_vector, dtype=np.int8)
+    vector.setflags(write=False)
+    return vector
 
 class Watchstander:
     """Class representing a watchstander."""
@@ -18,48 +41,66 @@ class Watchstander:
         """
         self.name = name
         self.is_n_head = is_n_head
-        self.availability_vectors = {}  # year-month -> vector
+        self.availability_vectors = {}  # (year, month) -> read-only int8 vector
         self.watch_percentage = 1.0  # Default to 100%
-        self.points_deviation = {}  # year-month -> deviation
+        self.points_deviation = {}  # (year, month) -> deviation
+        self._avail_cache = {}  # (year, month) -> calculate_monthly_availability result
+        self._dirty = False  # Set while deferred changes have not been saved
+        self._db_hash: Optional[bytes] = None  # Digest of the state last written to or loaded from the database
 
-    def set_monthly_availability(self, year: int, month: int, availability_vector: List[int]) -> None:
-        """Set the availability vector for a specific month."""
-        month_key = (year, month)
-        self.availability_vectors[month_key] = availability_vector
-        self._save_to_db()
+    def set_monthly_availability(self, year: int, month: int, availability_vector: List[int], defer_save: bool = False) -> None:
+        """
+        Set the availability vector for a specific month; it is stored as a read-only int8 array.
+        With defer_save=True the database is not written; save later with flush() or Watchstander.bulk_flush().
+        """
+        month_key = _month_key(year, month)
+        self.availability_vectors[month_key] = _as_vector(availability_vector)
+        self._avail_cache.pop(month_key, None)
+        if defer_save:
+            self._dirty = True
+        else:
+            self._save_to_db()
 
-    def get_monthly_availability(self, year: int, month: int) -> Optional[List[int]]:
+    def get_monthly_availability(self, year: int, month: int) -> Optional[np.ndarray]:
         """Get the availability vector for a specific month."""
-        month_key = (year, month)
-        return self.availability_vectors.get(month_key)
+        return self.availability_vectors.get(_month_key(year, month))
 
     def calculate_monthly_availability(self, year: int, month: int) -> Tuple[int, int, float]:
         """
         Calculate the availability statistics for a given month.
         Returns a tuple of (available_days, total_days, availability_percentage)
+        The result is cached until the month's availability is set again.
         """
-        month_key = f"{year:04d}-{month:02d}"
-        if month_key not in self.availability_vectors:
-            return 0, 0, 0.0
-
-        vector = self.availability_vectors[month_key]
-        total_days = len(vector)
-        available_days = sum(1 for day in vector if day in [0, 4, 5, 6, 7, 8, 9])
-        availability_percentage = (available_days / total_days) * 100 if total_days > 0 else 0.0
-
-        return available_days, total_days, availability_percentage
+        month_key = _month_key(year, month)
+        cached = self._avail_cache.get(month_key)
+        if cached is not None:
+            return cached
+        vector = self.get_monthly_availability(year, month)
+        if vector is None:
+            result = 0, 0, 0.0
+        else:
+            total_days = len(vector)
+            # AVAILABLE_CODES, counted by the same kernel Month uses for its roster
+            available_days = int(count_available(vector[np.newaxis, :])[0])
+            availability_percentage = (available_days / total_days) * 100 if total_days > 0 else 0.0
+            result = available_days, total_days, availability_percentage
+        self._avail_cache[month_key] = result
+        return result
 
-    def calculate_watch_percentage(self, year: int, month: int) -> float:
+    def calculate_watch_percentage(self, year: int, month: int, available_days: Optional[int] = None) -> float:
         """
         Calculate the percentage of watches this person should stand based on their availability
         relative to the total availability of all watchstanders.
+        Pass available_days when calculate_monthly_availability has already been called.
         Returns a float representing the percentage (0-100).
         """
         # Get this watchstander's available days
-        available_days, _, _ = self.calculate_monthly_availability(year, month)
+        if available_days is None:
+            available_days, _, _ = self.calculate_monthly_availability(year, month)
         
-        # Get total available days across all watchstanders
-        total_available, individual_available = calculate_total_availability(year, month)
+        # Get total available days across all watchstanders; cached per month, so scoring
+        # a whole roster does not re-query (or copy the per-person dict) for each watchstander
+        total_available = calculate_total_available_days(year, month)
         
         if total_available == 0:
             return 0.0
@@ -67,7 +108,8 @@ class Watchstander:
         # Calculate percentage
         return (available_days / total_available) * 100
 
-    def calculate_expected_watch_points(self, year: int, month: int, month_vector: List[int], n_head_count: int = 0) -> float:
+    def calculate_expected_watch_points(self, year: int, month: int, month_vector: List[int], n_head_count: int = 0,
+                                        n_head_points: Optional[float] = None) -> float:
         """
         Calculate the expected watch points this person should stand based on their availability percentage
         and the daily watch points from VALUE_KEY.
@@ -77,89 +119,156 @@ class Watchstander:
             month: The month
             month_vector: List of integers representing the type of each day (0: workday, 1: leading into weekend, 2: weekend, 3: final weekend day)
             n_head_count: Number of N-heads in the month (used to calculate total N-head points)
+            n_head_points: Total expected points of the month's N-heads, aggregated once by the caller;
+                defaults to n_head_count fully available N-heads
             
         Returns:
             float: The expected number of watch points this person should stand
         """
-        # Calculate total monthly points
-        total_monthly_points = 0
-        for day_type in month_vector:
-            if day_type == 0:  # Full workday
-                total_monthly_points += VALUE_KEY["Weekday day watch"] + VALUE_KEY["Weekday night watch"]
-            elif day_type == 1:  # Leading into weekend
-                total_monthly_points += VALUE_KEY["Friday day watch"] + VALUE_KEY["Friday night/Saturday/Sunday day"]  # 18 + 36
-            elif day_type == 2:  # Weekend day
-                total_monthly_points += VALUE_KEY["Friday night/Saturday/Sunday day"] + VALUE_KEY["Friday night/Saturday/Sunday day"]  # 36 + 36
-            elif day_type == 3:  # Final day of a weekend
-                total_monthly_points += VALUE_KEY["Friday night/Saturday/Sunday day"] + VALUE_KEY["Sunday night"]  # 36 + 20
+        # Both branches start from this watchstander's availability for the month
+        available_days, total_days, availability_percentage = self.calculate_monthly_availability(year, month)
+        if available_days == 0:
+            # A watchstander unavailable all month owes no points; skip the month and roster totals
+            return 0.0
+
+        # Calculate total monthly points from the points of each day type
+        total_monthly_points = monthly_points_kernel(np.asarray(month_vector, dtype=np.int8), _TOTAL_PER_DAYTYPE)
 
         if self.is_n_head:
-            # For N-heads, calculate their availability percentage and multiply by 28 points
-            available_days, total_days, availability_percentage = self.calculate_monthly_availability(year, month)
-            print(f"N-head {self.name} - Available Days: {available_days}, Total Days: {total_days}, Availability Percentage: {availability_percentage:.2f}%")
-            expected_points = (availability_percentage / 100) * VALUE_KEY["Expected N-Head watch monthly (one weekday and one weekend)"]
-            print(f"N-head {self.name} - Expected Points: {expected_points:.2f}")
+            # For N-heads, multiply their availability percentage by 28 points
+            logger.debug("N-head %s - Available Days: %d, Total Days: %d, Availability Percentage: %.2f%%",
+                         self.name, available_days, total_days, availability_percentage)
+            expected_points = (availability_percentage / 100) * _N_HEAD_MONTHLY_POINTS
+            logger.debug("N-head %s - Expected Points: %.2f", self.name, expected_points)
         else:
-            # Calculate total N-head points based on their availability percentages
-            n_head_points = 0
-            for ws in self.watchstanders:
-                if ws.is_n_head:
-                    available_days, total_days, availability_percentage = ws.calculate_monthly_availability(year, month)
-                    n_head_points += (availability_percentage / 100) * VALUE_KEY["Expected N-Head watch monthly (one weekday and one weekend)"]
+            # Total N-head points come from the caller rather than being re-summed for every watchstander
+            if n_head_points is None:
+                n_head_points = n_head_count * _N_HEAD_MONTHLY_POINTS
             
             # Calculate remaining points for regular watchstanders
             remaining_points = total_monthly_points - n_head_points
             
             # Calculate this person's percentage of watches among regular watchstanders
-            watch_percentage = self.calculate_watch_percentage(year, month)
+            watch_percentage = self.calculate_watch_percentage(year, month, available_days=available_days)
             
             # Calculate expected points from remaining points
             expected_points = (watch_percentage / 100) * remaining_points
 
         return expected_points
 
+    def _availability_columns(self) -> Dict[str, object]:
+        """Values of the WatchstanderDB availability columns for this watchstander."""
+        # The blob is the only stored copy; a legacy JSON copy is dropped when the row is saved
+        return {'availability_blobs': pack_availability_vectors(self.availability_vectors), 'availability_vectors': None}
+
+    def _state_hash(self, availability_blob: bytes) -> bytes:
+        """Digest of everything a save writes: the packed availability and the N-head flag."""
+        return hashlib.blake2b(availability_blob + bytes([bool(self.is_n_head)]), digest_size=16).digest()
+
+    @classmethod
+    def bulk_save(cls, watchstanders: List['Watchstander']) -> None:
+        """
+        Save many watchstanders with one lookup query and a single commit.
+        Watchstanders whose state matches what they last wrote or loaded are skipped; this assumes
+        no other process has changed or deleted their rows since. Immediate saves always write.
+        """
+        changed = []
+        for ws in watchstanders:
+            columns = ws._availability_columns()
+            state_hash = ws._state_hash(columns['availability_blobs'])
+            if state_hash == ws._db_hash:
+                ws._dirty = False
+            else:
+                changed.append((ws, columns, state_hash))
+        if not changed:
+            return
+        with db_session() as session:
+            names = {ws.name for ws, _, _ in changed}
+            existing = {
+                row.name: row
+                for row in session.query(WatchstanderDB).filter(WatchstanderDB.name.in_(names)).all()
+            }
+            for ws, columns, _ in changed:
+                row = existing.get(ws.name)
+                if row:
+                    # Update existing record
+                    row.is_n_head = ws.is_n_head
+                    for column, value in columns.items():
+                        setattr(row, column, value)
+                else:
+                    # Create new record
+                    row = WatchstanderDB(
+                        name=ws.name,
+                        is_n_head=ws.is_n_head,
+                        **columns
+                    )
+                    session.add(row)
+                    existing[ws.name] = row
+        for ws, _, state_hash in changed:
+            ws._dirty = False
+            ws._db_hash = state_hash
+        clear_availability_cache()
+
+    @classmethod
+    def bulk_flush(cls, watchstanders: Iterable['Watchstander']) -> None:
+        """Save the watchstanders that have deferred changes, in one transaction."""
+        cls.bulk_save([ws for ws in watchstanders if ws._dirty])
+
+    def flush(self) -> None:
+        """Save deferred changes to the database, if there are any."""
+        if self._dirty:
+            self._save_to_db()
+
     def _save_to_db(self) -> None:
         """Save the watchstander's data to the database."""
-        session = get_db_session()
-        try:
-            # Convert tuple keys to strings for JSON serialization
-            serializable_vectors = {f"{year}-{month:02d}": vector for (year, month), vector in self.availability_vectors.items()}
+        availability_columns = self._availability_columns()
+        state_hash = self._state_hash(availability_columns['availability_blobs'])
+        with db_session() as session:
             # Check if watchstander already exists
             existing = session.query(WatchstanderDB).filter_by(name=self.name).first()
             
             if existing:
                 # Update existing record
                 existing.is_n_head = self.is_n_head
-                existing.availability_vectors = serializable_vectors
+                for column, value in availability_columns.items():
+                    setattr(existing, column, value)
             else:
                 # Create new record
                 new_ws = WatchstanderDB(
                     name=self.name,
                     is_n_head=self.is_n_head,
-                    availability_vectors=serializable_vectors
+                    **availability_columns
                 )
                 session.add(new_ws)
-            
-            session.commit()
-        finally:
-            session.close()
+        self._dirty = False
+        self._db_hash = state_hash
+        clear_availability_cache()
 
     @classmethod
     def load_from_db(cls, name: str) -> Optional['Watchstander']:
         """Load a watchstander from the database by name."""
-        session = get_db_session()
-        try:
+        with db_session() as session:
             db_watchstander = session.query(WatchstanderDB).filter_by(name=name).first()
-            if db_watchstander:
-                watchstander = cls(
-                    name=db_watchstander.name,
-                    is_n_head=db_watchstander.is_n_head
-                )
-                watchstander.availability_vectors = db_watchstander.availability_vectors
-                return watchstander
-            return None
-        finally:
-            session.close()
+        if db_watchstander:
+            return cls.from_db_row(db_watchstander)
+        return None
+
+    @classmethod
+    def from_db_row(cls, db_row: WatchstanderDB) -> 'Watchstander':
+        """Build a watchstander from an already loaded database row without touching the database."""
+        watchstander = cls(name=db_row.name, is_n_head=db_row.is_n_head)
+        if db_row.availability_blobs is not None:
+            watchstander.availability_vectors = unpack_availability_vectors(db_row.availability_blobs)
+            if db_row.availability_vectors is None:
+                # Leave rows still holding a legacy JSON copy unhashed so the next save clears it
+                watchstander._db_hash = watchstander._state_hash(db_row.availability_blobs)
+        else:
+            # Saved before availability_blobs existed; JSON keys are "YYYY-MM"
+            watchstander.availability_vectors = {
+                tuple(map(int, key.split('-'))): _as_vector(vector)
+                for key, vector in (db_row.availability_vectors or {}).items()
+            }
+        return watchstander
 
     def __str__(self) -> str:
         return f"{self.name} (N-Head: {self.is_n_head})"
@@ -181,8 +290,7 @@ class Watchstander:
             expected_points (float): Expected points for the month
             actual_points (float): Actual points for the month
         """
-        key = f"{year}-{month:02d}"
-        self.points_deviation[key] = actual_points - expected_points
+        self.points_deviation[_month_key(year, month)] = actual_points - expected_points
 
     def get_points_deviation(self, year: int, month: int) -> float:
         """Get the points deviation for a specific month.
@@ -194,33 +302,4 @@ class Watchstander:
         Returns:
             float: Points deviation (actual - expected)
         """
-        key = f"{year}-{month:02d}"
-        return self.points_deviation.get(key, 0.0)
-
-if __name__ == "__main__":
-    # Example usage
-    watchstander1 = Watchstander("John Doe", True)  # N-head
-    watchstander2 = Watchstander("Jane Smith", False)  # Regular watchstander
-    
-    # Example availability vectors for January 2023
-    jan_availability1 = [0] * 31  # 31 days of January
-    jan_availability1[14:20] = [1, 2, 2, 2, 2, 3]  # Leave from 15th to 20th
-    watchstander1.set_monthly_availability(2023, 1, jan_availability1)
-    
-    jan_availability2 = [0] * 31  # 31 days of January
-    jan_availability2[10:15] = [1, 2, 2, 2, 3]  # Leave from 11th to 15th
-    watchstander2.set_monthly_availability(2023, 1, jan_availability2)
-    
-    # Example month vector for January 2023 (simplified)
-    jan_month_vector = [0] * 31  # All workdays for simplicity
-    jan_month_vector[6:8] = [1, 2, 2, 3]  # Weekend
-    jan_month_vector[13:15] = [1, 2, 2, 3]  # Weekend
-    jan_month_vector[20:22] = [1, 2, 2, 3]  # Weekend
-    jan_month_vector[27:29] = [1, 2, 2, 3]  # Weekend
-    
-    # Calculate expected watch points
-    points1 = watchstander1.calculate_expected_watch_points(2023, 1, jan_month_vector, n_head_count=1)
-    points2 = watchstander2.calculate_expected_watch_points(2023, 1, jan_month_vector, n_head_count=1)
-    
-    print(f"John Doe (N-head) expected watch points: {points1:.1f}")
-    print(f"Jane Smith (Regular) expected watch points: {points2:.1f}") 
\ No newline at end of file
+        return self.points_deviation.get(_month_key(year, month), 0.0)
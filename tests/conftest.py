@@ -0,0 +1,25 @@
+"""
+Shared fixtures for the test suite.
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src import database
+
+@pytest.fixture
+def empty_db(tmp_path, monkeypatch):
+    """Point the database module at an empty SQLite file; tables are left to the test."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'watchbill.db'}")
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "Session", sessionmaker(bind=engine, expire_on_commit=False))
+    monkeypatch.setattr(database, "_version_conn", None)
+    database.clear_availability_cache()
+    yield engine
+    database.clear_availability_cache()
+    engine.dispose()
+
+@pytest.fixture
+def temp_db(empty_db):
+    """Point the database module at a fresh SQLite file with the current schema."""
+    database.Base.metadata.create_all(empty_db)
+    return empty_db
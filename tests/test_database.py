@@ -0,0 +1,78 @@
+"""
+Tests for the database module.
+"""
+import json
+import sqlite3
+import numpy as np
+from sqlalchemy import inspect, text
+from src import database
+from src.database import WatchstanderDB, db_session, pack_availability_vectors, unpack_availability_vectors
+from src.watchstander import Watchstander
+
+def test_availability_blob_round_trip():
+    """Test that packed availability unpacks to the same months and vectors."""
+    vectors = {
+        (2025, 2): [0, 1, 2, 3, 4, 5, 6, 7, 8, 9] * 2 + [9] * 8,  # 28 days
+        (2025, 3): [9] * 31,
+        (2024, 12): [8, 0, 2] * 10 + [7],  # 31 days
+    }
+    unpacked = unpack_availability_vectors(pack_availability_vectors(vectors))
+    assert list(unpacked) == list(vectors)
+    for key, vector in vectors.items():
+        assert unpacked[key].dtype == np.int8
+        assert not unpacked[key].flags.writeable
+        assert unpacked[key].tolist() == vector
+    assert unpack_availability_vectors(pack_availability_vectors({})) == {}
+
+def test_migrate_legacy_schema(empty_db):
+    """Test that a database created before availability_blobs is migrated and its JSON rows still load."""
+    with empty_db.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE watchstanders (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, "
+            "is_n_head BOOLEAN NOT NULL, availability_vectors JSON)"))
+        conn.execute(
+            text("INSERT INTO watchstanders (name, is_n_head, availability_vectors) VALUES (:name, :n_head, :vectors)"),
+            {"name": "A", "n_head": True, "vectors": json.dumps({"2025-03": [0, 8, 9] * 10 + [2]})})
+    database._migrate_schema()
+
+    inspector = inspect(empty_db)
+    assert "availability_blobs" in {column["name"] for column in inspector.get_columns("watchstanders")}
+    assert any(index["column_names"] == ["name"] and index["unique"] for index in inspector.get_indexes("watchstanders"))
+    with db_session() as session:
+        row = session.query(WatchstanderDB).one()
+    watchstander = Watchstander.from_db_row(row)
+    assert watchstander.is_n_head
+    assert watchstander.get_monthly_availability(2025, 3).tolist() == [0, 8, 9] * 10 + [2]
+
+def test_saves_write_only_the_blob(temp_db):
+    """Test that saved availability lives in availability_blobs and is counted from there."""
+    watchstander = Watchstander("A")
+    watchstander.set_monthly_availability(2025, 2, [0, 2, 8, 9] * 7)
+    with db_session() as session:
+        row = session.query(WatchstanderDB).one()
+    assert row.availability_vectors is None
+    assert unpack_availability_vectors(row.availability_blobs)[(2025, 2)].tolist() == [0, 2, 8, 9] * 7
+    assert database.calculate_total_availability(2025, 2) == (21, {"A": 21})
+
+def test_resave_drops_legacy_json(temp_db):
+    """Test that saving a row loaded with both columns leaves only the blob."""
+    with db_session() as session:
+        session.add(WatchstanderDB(name="A", is_n_head=False,
+                                   availability_vectors={"2025-02": [0] * 28},
+                                   availability_blobs=pack_availability_vectors({(2025, 2): [0] * 28})))
+    with db_session() as session:
+        watchstander = Watchstander.from_db_row(session.query(WatchstanderDB).one())
+    watchstander.set_monthly_availability(2025, 2, [0] * 28, defer_save=True)  # Unchanged availability
+    Watchstander.bulk_flush([watchstander])
+    with db_session() as session:
+        assert session.query(WatchstanderDB).one().availability_vectors is None
+
+def test_total_availability_cache_sees_other_writers(temp_db, tmp_path):
+    """Test that cached availability totals are recomputed after another connection writes."""
+    Watchstander("A").set_monthly_availability(2025, 2, [0] * 28)
+    assert database.calculate_total_availability(2025, 2) == (28, {"A": 28})
+    other = sqlite3.connect(tmp_path / "watchbill.db")
+    with other:
+        other.execute("DELETE FROM watchstanders")
+    other.close()
+    assert database.calculate_total_availability(2025, 2) == (0, {})
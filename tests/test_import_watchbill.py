@@ -0,0 +1,25 @@
+"""
+Tests for the watchbill import module.
+"""
+import pytest
+from src.import_watchbill import build_month_from_table
+
+def _table(*rows):
+    """Tab separated table text, one (name, codes) pair per line."""
+    return "\n".join("\t".join([name, *map(str, codes)]) for name, codes in rows)
+
+def test_build_month_from_table(temp_db):
+    """Test that a pasted table becomes the month's roster."""
+    month = build_month_from_table(_table(("A", [0, 9] * 14), ("B", [2] * 28)), 2025, 2, ["B"])
+    assert month.get_watchstander("A").get_monthly_availability(2025, 2).tolist() == [0, 9] * 14
+    assert [ws.name for ws in month.get_n_heads()] == ["B"]
+
+@pytest.mark.parametrize("rows, message", [
+    ((("A", [0] * 28), ("B", [0] * 27)), "Watchstander B must have a filled availability vector of length 28"),
+    ((("A", [0] * 27 + [200]),), "Watchstander A has invalid availability code 200 on day 28"),
+    ((("A", [0] * 27 + ["x"]),), "Invalid availability values"),
+])
+def test_build_month_from_table_rejects_bad_rows(temp_db, rows, message):
+    """Test that ragged rows and unknown codes raise a ValueError naming the problem."""
+    with pytest.raises(ValueError, match=message):
+        build_month_from_table(_table(*rows), 2025, 2, [])
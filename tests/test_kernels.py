@@ -0,0 +1,124 @@
+"""
+Tests for the compiled kernels and their NumPy fallbacks.
+"""
+import numpy as np
+import pytest
+from src import _kernels
+from src.constants import AVAILABLE_CODES
+from src.watchbill_model import WatchbillModel, _UNAVAILABLE_MASK
+from src.watchstander import Watchstander
+
+# (rows, days) of the random matrices, including empty and one-row ones
+SHAPES = [(0, 31), (1, 31), (1, 1), (5, 28), (12, 31), (3, 0)]
+
+def _random_matrix(rng, shape, low, high):
+    """Random int8 matrix with values in [low, high)."""
+    return rng.integers(low, high, size=shape).astype(np.int8)
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_count_available_matches_numpy(shape):
+    """count_available agrees with its NumPy fallback and AVAILABLE_CODES, including out-of-range codes."""
+    vecs = _random_matrix(np.random.default_rng(0), shape, -1, 11)
+    counts = _kernels.count_available(vecs)
+    np.testing.assert_array_equal(counts, _kernels._count_available_numpy(vecs, _kernels.AVAILABLE_TABLE))
+    assert counts.tolist() == [sum(int(v) in AVAILABLE_CODES for v in row) for row in vecs]
+
+@pytest.mark.parametrize("n_days", [0, 1, 28, 31])
+def test_monthly_points_matches_numpy(n_days):
+    """monthly_points_kernel agrees with its NumPy fallback; unknown day types add nothing."""
+    day_types = _random_matrix(np.random.default_rng(n_days), (n_days,), -1, 5)
+    points = np.array([26.0, 54.0, 72.0, 56.0])
+    assert _kernels.monthly_points_kernel(day_types, points) == pytest.approx(
+        _kernels._monthly_points_numpy(day_types, points))
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_expected_points_matches_numpy(shape):
+    """expected_points_kernel agrees with its NumPy fallback."""
+    rng = np.random.default_rng(1)
+    n, days = shape
+    args = (
+        _random_matrix(rng, shape, 0, 10),
+        rng.choice([12.0, 18.0, 36.0], size=days),
+        rng.choice([14.0, 20.0, 36.0], size=days),
+        rng.random(n) < 0.3,
+        rng.random(n),
+        1050.0,
+        28.0,
+    )
+    for compiled, fallback in zip(_kernels.expected_points_kernel(*args), _kernels._expected_points_numpy(*args)):
+        np.testing.assert_allclose(compiled, fallback)
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_watchbill_rules_matches_numpy(shape):
+    """watchbill_rules_kernel agrees with its NumPy fallback."""
+    rng = np.random.default_rng(2)
+    n, days = shape
+    args = (
+        _random_matrix(rng, shape, 0, 8),
+        _UNAVAILABLE_MASK,
+        rng.random(n) < 0.5,
+        _random_matrix(rng, (days,), 0, 4),
+    )
+    for compiled, fallback in zip(_kernels.watchbill_rules_kernel(*args), _kernels._watchbill_rules_numpy(*args)):
+        np.testing.assert_array_equal(compiled, fallback)
+
+def test_watchbill_rules_counts_hand_built_watchbill():
+    """watchbill_rules_kernel flags Rule 1 and counts Rules 2-5 on a small hand-checked watchbill."""
+    wb = np.array([
+        [0, 0, 0, 1, 0, 0],  # N-head day watch on a weekend day
+        [0, 0, 0, 1, 0, 0],  # The same watch is fine for anyone else
+        [0, 1, 0, 7, 1, 0],  # Code 7 followed by a watch
+        [7, 0, 1, 0, 0, 0],  # Code 7 with a day watch two days later
+        [1, 7, 0, 0, 0, 0],  # A day watch next to code 7
+    ], dtype=np.int8)
+    is_n_head = np.array([True, False, False, False, False])
+    day_types = np.array([0, 0, 0, 2, 0, 0], dtype=np.int8)
+    for kernel in (_kernels.watchbill_rules_kernel, _kernels._watchbill_rules_numpy):
+        rule1, rule_counts, watch_counts = kernel(wb, _UNAVAILABLE_MASK, is_n_head, day_types)
+        assert np.argwhere(rule1).tolist() == [[0, 3]]
+        assert rule_counts.tolist() == [[0, 0, 0, 0], [0, 0, 0, 0], [1, 0, 1, 0], [0, 1, 0, 0], [1, 0, 1, 1]]
+        assert watch_counts.tolist() == [1, 1, 3, 2, 2]
+
+def _reference_feedback(model, watchbill):
+    """evaluate_watchbill feedback computed with the original per-element loops."""
+    unavailable = [1, 2, 3, 4, 5, 7]
+    feedback = []
+    for i, person in enumerate(model.watchstanders):
+        if person.is_n_head:
+            for j, watch in enumerate(watchbill[i]):
+                if watch == 1 and model.month_vector[j] != 0:
+                    feedback.append(f"Rule 1 violation: {person.name} assigned day watch on non-workday.")
+    checks = [
+        ("Rule 2 violation: Watch scheduled before leave/TDY/special liberty.", -1, lambda w: w != 0),
+        ("Rule 3 violation: Day watch scheduled two days before leave/TDY/special liberty.", -2, lambda w: w == 1),
+        ("Rule 4 violation: Watch scheduled after leave/TDY/special liberty.", 1, lambda w: w != 0),
+        ("Rule 5 violation: Day watch scheduled the day after leave/TDY/special liberty.", 1, lambda w: w == 1),
+    ]
+    for message, offset, is_violation in checks:
+        for person in watchbill:
+            for j, watch in enumerate(person):
+                if 0 <= j + offset < len(person) and person[j + offset] in unavailable and is_violation(watch):
+                    feedback.append(message)
+    monthly_total = model.monthly_total()
+    available = [sum(monthly_total[j] for j, code in enumerate(person) if code in [0, 4, 5, 6]) for person in watchbill]
+    expected_watch = [a / sum(available) * model.monthly_total_score() for a in available]
+    for i, person in enumerate(watchbill):
+        total_watches = sum(1 for watch in person if watch != 0)
+        if abs(total_watches - expected_watch[i]) > 1:
+            feedback.append(f"Rule 6 violation: {model.watchstanders[i].name} has {total_watches} watches, expected {expected_watch[i]}.")
+    for i, person in enumerate(watchbill):
+        if sum(1 for watch in person if watch != 0) == 0:
+            feedback.append(f"Rule 9 violation: {model.watchstanders[i].name} has no watches assigned.")
+    return feedback
+
+@pytest.mark.parametrize("seed", range(300))
+def test_evaluate_watchbill_matches_reference(seed):
+    """evaluate_watchbill gives the same feedback as the original loop implementation."""
+    rng = np.random.default_rng(seed)
+    n, days = int(rng.integers(1, 8)), int(rng.integers(1, 32))
+    month_vector = rng.integers(0, 4, size=days).tolist()
+    watchstanders = [Watchstander(f"P{i}", bool(rng.random() < 0.4)) for i in range(n)]
+    watchbill = rng.choice(8, size=(n, days), p=[0.4, 0.2, 0.2, 0.04, 0.04, 0.04, 0.04, 0.04]).tolist()
+    watchbill[0][0] = 0  # At least one available day, so the expected watch shares are defined
+    model = WatchbillModel(month_vector, watchstanders)
+    assert model.evaluate_watchbill(watchbill)["feedback"] == _reference_feedback(model, watchbill)
@@ -2,7 +2,9 @@
 Tests for the main application module.
 """
 from fastapi.testclient import TestClient
-from src.main import app
+from src.database import db_session
+from src.main import app, get_db
+from src.watchstander import Watchstander
 
 client = TestClient(app)
 
@@ -10,4 +12,23 @@ def test_read_root():
     """Test the root endpoint."""
     response = client.get("/")
     assert response.status_code == 200
-    assert response.json() == {"message": "Welcome to Watchbill CDS7 API"} 
\ No newline at end of file
+    assert response.json() == {"message": "Welcome to Watchbill CDS7 API"} 
+def test_list_watchstanders(temp_db):
+    """Test that /watchstanders lists the stored watchstanders."""
+    Watchstander("A", is_n_head=True).set_monthly_availability(2025, 2, [0] * 28)
+    Watchstander("B").set_monthly_availability(2025, 2, [9] * 28)
+
+    def override_get_db():
+        with db_session() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        response = client.get("/watchstanders")
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 200
+    assert sorted(response.json(), key=lambda ws: ws["name"]) == [
+        {"name": "A", "is_n_head": True},
+        {"name": "B", "is_n_head": False},
+    ]
@@ -0,0 +1,52 @@
+"""
+Tests for the month module.
+"""
+import pytest
+from src.month import Month
+from src.watchstander import Watchstander
+
+def _month_with_roster(names):
+    """March 2025 with fully available watchstanders; nothing is saved to the database."""
+    month = Month(2025, 3)
+    for name in names:
+        watchstander = Watchstander(name)
+        watchstander.set_monthly_availability(2025, 3, [0] * 31, defer_save=True)
+        month.add_watchstander(watchstander)
+    return month
+
+def test_add_watches_matches_add_watch():
+    """Test that batched watches, with repeated names and days, score like one add_watch call each."""
+    names = ["B", "A", "B", "C", "B", "A", "A"]
+    days = [1, 7, 7, 7, 1, 31, 7]
+    watch_types = ["D", "N", "N", "D", "D", "N", "N"]
+    batched = _month_with_roster(["A", "B", "C", "D"])
+    batched.add_watches(names, days, watch_types)
+    single = _month_with_roster(["A", "B", "C", "D"])
+    for name, day, watch_type in zip(names, days, watch_types):
+        single.add_watch(name, day, watch_type)
+    assert batched.actual_watch_points == pytest.approx(single.actual_watch_points)
+    assert batched.actual_watch_points["D"] == 0.0
+
+def test_add_watches_validates_before_adding():
+    """Test that an invalid entry leaves every watchstander's points unchanged."""
+    month = _month_with_roster(["A"])
+    with pytest.raises(ValueError, match="Invalid day: 32"):
+        month.add_watches(["A", "A"], [1, 32], ["D", "N"])
+    assert month.actual_watch_points == {"A": 0.0}
+
+def test_expected_points_follow_watchstander_changes():
+    """Test that changes made on rostered watchstanders reach the cached expected points."""
+    month = _month_with_roster(["A", "B", "C"])
+    before = month.calculate_expected_watch_points()
+    watchstander = month.get_watchstander("A")
+    watchstander.set_monthly_availability(2025, 3, [2] * 31, defer_save=True)
+    watchstander.is_n_head = True
+    month.get_watchstander("B").set_watch_percentage(0.5)
+    after = month.calculate_expected_watch_points()
+
+    fresh = Month(2025, 3)
+    for ws in month.get_all_watchstanders():
+        fresh.add_watchstander(ws)
+    assert after == pytest.approx(fresh.calculate_expected_watch_points())
+    assert after != before
+    assert month.get_n_heads() == [watchstander]
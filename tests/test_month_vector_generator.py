@@ -0,0 +1,26 @@
+"""
+Tests for the month vector generator module.
+"""
+from datetime import date
+from src.month_vector_generator import federal_holidays_for_year, federal_holiday_mask, generate_month_vector, is_federal_holiday
+
+def test_nth_weekday_holidays():
+    """Test that Nth-weekday holidays resolve to the right week of the month."""
+    holidays = federal_holidays_for_year(2025)
+    assert date(2025, 1, 20) in holidays  # 3rd Monday in January
+    assert date(2025, 5, 26) in holidays  # Last Monday in May
+    assert date(2025, 11, 27) in holidays  # 4th Thursday in November
+    assert len(holidays) == 11
+
+def test_is_federal_holiday():
+    """Test single-date holiday lookups."""
+    assert is_federal_holiday(date(2026, 7, 4))
+    assert not is_federal_holiday(date(2026, 7, 5))
+
+def test_weekend_holiday_mask():
+    """Test that holidays falling on a weekend are still marked in the month mask."""
+    mask = federal_holiday_mask(2026, 7)
+    assert mask[3] == is_federal_holiday(date(2026, 7, 4))
+    assert mask.sum() == 1
+    # Saturday holidays leave the weekend coding alone: Friday 3rd, Saturday 4th, Sunday 5th
+    assert generate_month_vector(2026, 7)[2:5] == (1, 2, 3)
@@ -0,0 +1,24 @@
+"""
+Tests for the watchbill model module.
+"""
+import pytest
+from src.watchbill_model import WatchbillModel
+
+def test_shift_evaluator():
+    """Test the points of each shift on each day type."""
+    model = WatchbillModel([0, 1, 2, 3], [])
+    wh, wodh, weh = model.wh, model.wodh, model.weh
+    assert [model.shift_evaluator("D", day) for day in range(4)] == [
+        4 * wodh + 8 * wh, 8 * wodh + 4 * weh, 12 * weh, 12 * weh]
+    assert [model.shift_evaluator("N", day) for day in range(4)] == [
+        12 * wodh, 12 * weh, 12 * weh, 4 * weh + 8 * wodh]
+    assert model.shift_evaluator("0", 0) == 0
+    with pytest.raises(ValueError, match="Invalid shift or date input"):
+        model.shift_evaluator("X", 0)
+
+def test_invalid_month_vector_raises_on_use():
+    """Test that an invalid month vector is only rejected by the calculations that need the daily totals."""
+    model = WatchbillModel([0, 1, 7, 3], [])
+    assert model.calculate_total_watch_points() == WatchbillModel([0, 1, 3], []).calculate_total_watch_points()
+    with pytest.raises(ValueError, match="Invalid input in month vector"):
+        model.monthly_total()
@@ -0,0 +1,33 @@
+"""
+Tests for the watchstander module.
+"""
+from sqlalchemy import event
+from src import database
+from src.database import WatchstanderDB, db_session
+from src.watchstander import Watchstander
+
+def test_bulk_flush_saves_only_dirty_watchstanders(temp_db):
+    """Test that bulk_flush writes the dirty watchstanders in one commit and clears their dirty flag."""
+    clean = Watchstander("C")
+    clean.set_monthly_availability(2025, 3, [0] * 31)
+    # Change the saved row behind the clean watchstander's back; flushing must leave it alone
+    with db_session() as session:
+        session.query(WatchstanderDB).filter_by(name="C").one().is_n_head = True
+    dirty = [Watchstander("A"), Watchstander("B", True)]
+    for watchstander in dirty:
+        watchstander.set_monthly_availability(2025, 3, [2] * 31, defer_save=True)
+
+    commits = []
+    event.listen(database.Session, "after_commit", lambda session: commits.append(session))
+    Watchstander.bulk_flush(dirty + [clean])
+
+    assert len(commits) == 1
+    assert not any(watchstander._dirty for watchstander in dirty)
+    with db_session() as session:
+        rows = {row.name: row for row in session.query(WatchstanderDB).all()}
+    saved = {name: Watchstander.from_db_row(row) for name, row in rows.items()}
+    assert saved["A"].get_monthly_availability(2025, 3).tolist() == [2] * 31
+    assert saved["B"].get_monthly_availability(2025, 3).tolist() == [2] * 31
+    assert saved["B"].is_n_head
+    assert saved["C"].get_monthly_availability(2025, 3).tolist() == [0] * 31
+    assert saved["C"].is_n_head  # Changed in the database and not overwritten